@@ -2,47 +2,89 @@
 Accounting & Tax Service
 Double-entry bookkeeping with TVA tracking (19.25%)
 """
-from fastapi import FastAPI, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from decimal import Decimal
-from typing import List, Optional
+from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, case, insert, lambda_stmt, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from contextlib import asynccontextmanager
+from typing import Annotated, AsyncIterator, List, Optional
 from uuid import UUID
 from datetime import datetime, date
-import threading
+import asyncio
 import os
+import re
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from shared.database import create_db_engine, get_session_factory, get_db_session, Base
+from shared.database import (
+    create_async_db_engine,
+    get_async_session_factory,
+    get_async_db_session,
+    Base
+)
 from shared.auth import get_current_user, require_roles, Roles
 from shared.logging_config import configure_logging
-from shared.events import EventPublisher, EventConsumer, EventEnvelope
+from shared.events import EventPublisher, EventEnvelope
+from shared.async_events import AsyncEventConsumer
 
 import models
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, TypeAdapter
 
 # Initialize
 logger = configure_logging("accounting-service")
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_db_engine(DATABASE_URL)
-SessionFactory = get_session_factory(engine)
-if os.getenv("AUTO_CREATE_DB", "true").lower() == "true":
-    Base.metadata.create_all(bind=engine)
+
+async_engine = create_async_db_engine(DATABASE_URL)
+AsyncSessionFactory = get_async_session_factory(async_engine)
 
 RABBITMQ_URL = os.getenv("RABBITMQ_URL")
 event_publisher = EventPublisher(RABBITMQ_URL, "accounting-service") if RABBITMQ_URL else None
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize service and cleanup on shutdown"""
+    logger.info("Accounting service starting up")
+    if os.getenv("AUTO_CREATE_DB", "true").lower() == "true":
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    if event_publisher:
+        event_publisher.connect()
+
+    # Setup event consumer
+    if RABBITMQ_URL:
+        consumer = AsyncEventConsumer(RABBITMQ_URL, "accounting-service", "accounting_queue")
+        await consumer.connect()
+        consumer.register_batch_handler("sale.created", handle_tax_events)
+        consumer.register_batch_handler("purchase.received", handle_tax_events)
+        app.state.accounting_consumer = consumer
+        app.state.accounting_consumer_task = asyncio.create_task(consumer.consume())
+
+    yield
+
+    logger.info("Accounting service shutting down")
+    if event_publisher:
+        event_publisher.close()
+    if hasattr(app.state, "accounting_consumer"):
+        app.state.accounting_consumer_task.cancel()
+        await app.state.accounting_consumer.close()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title="Accounting & Tax Service",
     description="Double-entry bookkeeping with TVA tracking",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 
-def get_db():
-    with get_db_session(SessionFactory) as session:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_db_session(AsyncSessionFactory) as session:
         yield session
 
 
@@ -50,6 +92,11 @@ def get_db():
 # Schemas
 # ============================================
 
+# Fiscal periods are stored as DATE (first of month) / SMALLINT but keep their YYYY-MM / YYYY JSON form
+FiscalMonth = Annotated[date, PlainSerializer(lambda d: d.strftime('%Y-%m'), return_type=str, when_used='json')]
+FiscalYear = Annotated[int, PlainSerializer(lambda y: str(y), return_type=str, when_used='json')]
+
+
 class AccountCreate(BaseModel):
     code: str
     name: str
@@ -72,7 +119,7 @@ class AccountResponse(BaseModel):
 
 
 class LedgerEntryCreate(BaseModel):
-    entry_date: str = Field(..., pattern=r'^\d{4}-\d{2}-\d{2}$')
+    entry_date: date
     entry_type: models.EntryType
     debit_account_id: UUID
     credit_account_id: UUID
@@ -88,16 +135,18 @@ class LedgerEntryResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: UUID
-    entry_date: str
+    entry_date: date
     entry_type: models.EntryType
     debit_account_id: UUID
     credit_account_id: UUID
+    debit_account_code: str
+    credit_account_code: str
     amount: int
     reference_type: Optional[str]
     reference_id: Optional[UUID]
     description: Optional[str]
-    fiscal_month: str
-    fiscal_year: str
+    fiscal_month: FiscalMonth
+    fiscal_year: FiscalYear
     is_reversed: int
     created_at: datetime
 
@@ -108,7 +157,7 @@ class TaxRecordCreate(BaseModel):
     tax_rate: int = Field(default=1925, description="Tax rate (1925 = 19.25%)")
     reference_type: str
     reference_id: UUID
-    transaction_date: str = Field(..., pattern=r'^\d{4}-\d{2}-\d{2}$')
+    transaction_date: date
     description: Optional[str] = None
     notes: Optional[str] = None
     idempotency_key: Optional[str] = None
@@ -124,15 +173,15 @@ class TaxRecordResponse(BaseModel):
     tax_amount: int
     reference_type: str
     reference_id: UUID
-    transaction_date: str
-    fiscal_month: str
-    fiscal_year: str
+    transaction_date: date
+    fiscal_month: FiscalMonth
+    fiscal_year: FiscalYear
     description: Optional[str]
     created_at: datetime
 
 
 class MonthlyTVAReport(BaseModel):
-    fiscal_month: str
+    fiscal_month: FiscalMonth
     tva_collectee: int  # TVA collected (on sales)
     tva_deductible: int  # TVA deductible (on purchases)
     tva_net: int  # Net TVA (to pay or to recover)
@@ -149,6 +198,54 @@ class TrialBalanceEntry(BaseModel):
     balance: int
 
 
+def response_columns(model, schema) -> list:
+    """Model columns matching the fields of a response schema"""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+# Prebuilt list serializers: list endpoints return raw JSON so rows are not validated again
+ACCOUNT_LIST_ADAPTER = TypeAdapter(List[AccountResponse])
+LEDGER_ENTRY_LIST_ADAPTER = TypeAdapter(List[LedgerEntryResponse])
+TAX_RECORD_LIST_ADAPTER = TypeAdapter(List[TaxRecordResponse])
+MONTHLY_TVA_LIST_ADAPTER = TypeAdapter(List[MonthlyTVAReport])
+TRIAL_BALANCE_LIST_ADAPTER = TypeAdapter(List[TrialBalanceEntry])
+
+
+# Fiscal period formats, compiled once and shared by all period filters
+FISCAL_MONTH_RE = re.compile(r'\d{4}-(0[1-9]|1[0-2])')
+FISCAL_YEAR_RE = re.compile(r'\d{4}')
+
+
+def parse_fiscal_month(fiscal_month: str) -> date:
+    """Stored form of a validated YYYY-MM fiscal month (first day of the month)"""
+    return date(int(fiscal_month[:4]), int(fiscal_month[5:]), 1)
+
+
+# Filter dependencies are async: CPU-only, so they run on the loop instead of the threadpool
+async def fiscal_month_filter(fiscal_month: Optional[str] = None) -> Optional[date]:
+    """Optional fiscal_month query parameter (YYYY-MM)"""
+    if fiscal_month is None:
+        return None
+    if not FISCAL_MONTH_RE.fullmatch(fiscal_month):
+        raise HTTPException(status_code=422, detail="Invalid fiscal_month format. Use YYYY-MM")
+    return parse_fiscal_month(fiscal_month)
+
+
+async def fiscal_year_filter(fiscal_year: Optional[str] = None) -> Optional[int]:
+    """Optional fiscal_year query parameter (YYYY)"""
+    if fiscal_year is None:
+        return None
+    if not FISCAL_YEAR_RE.fullmatch(fiscal_year):
+        raise HTTPException(status_code=422, detail="Invalid fiscal_year format. Use YYYY")
+    return int(fiscal_year)
+
+
+# List endpoints select plain columns and skip ORM object hydration
+ACCOUNT_COLUMNS = response_columns(models.Account, AccountResponse)
+LEDGER_ENTRY_COLUMNS = response_columns(models.LedgerEntry, LedgerEntryResponse)
+TAX_RECORD_COLUMNS = response_columns(models.TaxRecord, TaxRecordResponse)
+
+
 # ============================================
 # Chart of Accounts Endpoints
 # ============================================
@@ -157,23 +254,25 @@ class TrialBalanceEntry(BaseModel):
 async def create_account(
     account_data: AccountCreate,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.COMPTABLE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new account in the chart of accounts"""
     # Check if code exists
-    if db.query(models.Account).filter_by(code=account_data.code).first():
+    if await db.scalar(select(1).where(models.Account.code == account_data.code).limit(1)):
         raise HTTPException(status_code=400, detail="Account code already exists")
 
     # Verify parent account exists if specified
     if account_data.parent_account_id:
-        parent = db.query(models.Account).filter_by(id=account_data.parent_account_id).first()
+        parent = await db.scalar(
+            select(1).where(models.Account.id == account_data.parent_account_id).limit(1)
+        )
         if not parent:
             raise HTTPException(status_code=404, detail="Parent account not found")
 
-    account = models.Account(**account_data.model_dump())
-    db.add(account)
-    db.commit()
-    db.refresh(account)
+    account = await db.scalar(
+        insert(models.Account).values(**account_data.model_dump()).returning(models.Account)
+    )
+    await db.commit()
 
     logger.info("Account created", account_id=str(account.id), code=account.code)
     return AccountResponse.model_validate(account)
@@ -186,25 +285,29 @@ async def list_accounts(
     skip: int = 0,
     limit: int = 100,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List accounts"""
-    query = db.query(models.Account).filter_by(is_active=is_active)
+    stmt = lambda_stmt(lambda: select(*ACCOUNT_COLUMNS).where(models.Account.is_active == is_active))
     if account_type:
-        query = query.filter_by(account_type=account_type)
+        stmt += lambda s: s.where(models.Account.account_type == account_type)
+    stmt += lambda s: s.offset(skip).limit(limit)
 
-    accounts = query.offset(skip).limit(limit).all()
-    return [AccountResponse.model_validate(a) for a in accounts]
+    rows = (await db.execute(stmt)).mappings().all()
+    return Response(
+        content=ACCOUNT_LIST_ADAPTER.dump_json([AccountResponse.model_construct(**row) for row in rows]),
+        media_type="application/json"
+    )
 
 
 @app.get("/api/v1/accounts/{account_id}", response_model=AccountResponse)
 async def get_account(
     account_id: UUID,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get account by ID"""
-    account = db.query(models.Account).filter_by(id=account_id).first()
+    account = await db.scalar(select(models.Account).filter_by(id=account_id))
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     return AccountResponse.model_validate(account)
@@ -217,46 +320,49 @@ async def get_account(
 @app.post("/api/v1/ledger-entries", response_model=LedgerEntryResponse, status_code=201)
 async def create_ledger_entry(
     entry_data: LedgerEntryCreate,
+    background_tasks: BackgroundTasks,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.COMPTABLE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a ledger entry (append-only)"""
-    # Verify accounts exist
-    debit_account = db.query(models.Account).filter_by(id=entry_data.debit_account_id).first()
-    credit_account = db.query(models.Account).filter_by(id=entry_data.credit_account_id).first()
+    # Verify both accounts exist and fetch their codes (single round-trip)
+    account_ids = {entry_data.debit_account_id, entry_data.credit_account_id}
+    account_codes = dict((await db.execute(
+        select(models.Account.id, models.Account.code).where(models.Account.id.in_(account_ids))
+    )).all())
 
-    if not debit_account or not credit_account:
+    if len(account_codes) != len(account_ids):
         raise HTTPException(status_code=404, detail="Debit or credit account not found")
 
-    # Idempotency check
-    if entry_data.idempotency_key:
-        existing = db.query(models.LedgerEntry).filter_by(
+    # Insert atomically; a duplicate idempotency key yields no row
+    entry = await db.scalar(
+        pg_insert(models.LedgerEntry)
+        .values(
+            **entry_data.model_dump(exclude={'idempotency_key'}),
+            debit_account_code=account_codes[entry_data.debit_account_id],
+            credit_account_code=account_codes[entry_data.credit_account_id],
+            user_id=current_user.user_uuid,
             idempotency_key=entry_data.idempotency_key
-        ).first()
-        if existing:
-            logger.warning("Duplicate ledger entry ignored", idempotency_key=entry_data.idempotency_key)
-            return LedgerEntryResponse.model_validate(existing)
-
-    # Calculate fiscal period
-    entry_date = datetime.strptime(entry_data.entry_date, '%Y-%m-%d')
-    fiscal_month = entry_date.strftime('%Y-%m')
-    fiscal_year = entry_date.strftime('%Y')
-
-    # Create entry
-    entry = models.LedgerEntry(
-        **entry_data.model_dump(exclude={'idempotency_key'}),
-        fiscal_month=fiscal_month,
-        fiscal_year=fiscal_year,
-        user_id=UUID(current_user.user_id),
-        idempotency_key=entry_data.idempotency_key
+        )
+        .on_conflict_do_nothing(index_elements=['idempotency_key'])
+        .returning(models.LedgerEntry)
     )
-    db.add(entry)
-    db.commit()
-    db.refresh(entry)
 
-    # Publish event
+    if entry is None:
+        logger.warning("Duplicate ledger entry ignored", idempotency_key=entry_data.idempotency_key)
+        existing = await db.scalar(
+            select(models.LedgerEntry).where(
+                models.LedgerEntry.idempotency_key == entry_data.idempotency_key
+            )
+        )
+        return LedgerEntryResponse.model_validate(existing)
+
+    await db.commit()
+
+    # Publish event after the response is sent
     if event_publisher:
-        event_publisher.publish_event(
+        background_tasks.add_task(
+            event_publisher.publish_event,
             "ledger.posted",
             {
                 "entry_id": str(entry.id),
@@ -264,7 +370,7 @@ async def create_ledger_entry(
                 "amount": entry.amount,
                 "reference_type": entry.reference_type,
                 "reference_id": str(entry.reference_id) if entry.reference_id else None,
-                "fiscal_month": fiscal_month
+                "fiscal_month": entry.fiscal_month.strftime('%Y-%m')
             }
         )
 
@@ -275,28 +381,44 @@ async def create_ledger_entry(
 @app.get("/api/v1/ledger-entries", response_model=List[LedgerEntryResponse])
 async def list_ledger_entries(
     entry_type: Optional[models.EntryType] = None,
-    fiscal_month: Optional[str] = Query(None, pattern=r'^\d{4}-\d{2}$'),
+    fiscal_month: Optional[date] = Depends(fiscal_month_filter),
     reference_type: Optional[str] = None,
     reference_id: Optional[UUID] = None,
+    after_date: Optional[date] = None,
+    after_id: Optional[UUID] = None,
     skip: int = 0,
     limit: int = 100,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """List ledger entries"""
-    query = db.query(models.LedgerEntry)
+    """List ledger entries (pass the last entry's date/id as after_date/after_id for the next page)"""
+    if (after_date is None) != (after_id is None):
+        raise HTTPException(status_code=422, detail="after_date and after_id must be passed together")
+
+    stmt = lambda_stmt(lambda: select(*LEDGER_ENTRY_COLUMNS))
 
     if entry_type:
-        query = query.filter_by(entry_type=entry_type)
+        stmt += lambda s: s.where(models.LedgerEntry.entry_type == entry_type)
     if fiscal_month:
-        query = query.filter_by(fiscal_month=fiscal_month)
+        stmt += lambda s: s.where(models.LedgerEntry.fiscal_month == fiscal_month)
     if reference_type:
-        query = query.filter_by(reference_type=reference_type)
+        stmt += lambda s: s.where(models.LedgerEntry.reference_type == reference_type)
     if reference_id:
-        query = query.filter_by(reference_id=reference_id)
+        stmt += lambda s: s.where(models.LedgerEntry.reference_id == reference_id)
+    if after_date and after_id:
+        stmt += lambda s: s.where(
+            tuple_(models.LedgerEntry.entry_date, models.LedgerEntry.id) < tuple_(after_date, after_id)
+        )
 
-    entries = query.order_by(models.LedgerEntry.entry_date.desc()).offset(skip).limit(limit).all()
-    return [LedgerEntryResponse.model_validate(e) for e in entries]
+    stmt += lambda s: s.order_by(
+        models.LedgerEntry.entry_date.desc(), models.LedgerEntry.id.desc()
+    ).offset(skip).limit(limit)
+
+    rows = (await db.execute(stmt)).mappings().all()
+    return Response(
+        content=LEDGER_ENTRY_LIST_ADAPTER.dump_json([LedgerEntryResponse.model_construct(**row) for row in rows]),
+        media_type="application/json"
+    )
 
 
 @app.post("/api/v1/ledger-entries/{entry_id}/reverse", response_model=LedgerEntryResponse, status_code=201)
@@ -304,10 +426,10 @@ async def reverse_ledger_entry(
     entry_id: UUID,
     notes: Optional[str] = None,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.COMPTABLE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Reverse a ledger entry (create reversing entry)"""
-    original_entry = db.query(models.LedgerEntry).filter_by(id=entry_id).first()
+    original_entry = await db.scalar(select(models.LedgerEntry).filter_by(id=entry_id))
     if not original_entry:
         raise HTTPException(status_code=404, detail="Ledger entry not found")
 
@@ -315,32 +437,28 @@ async def reverse_ledger_entry(
         raise HTTPException(status_code=400, detail="Entry already reversed")
 
     # Create reversing entry (swap debit and credit)
-    today = date.today().strftime('%Y-%m-%d')
-    fiscal_month = date.today().strftime('%Y-%m')
-    fiscal_year = date.today().strftime('%Y')
+    today = date.today()
 
-    reversing_entry = models.LedgerEntry(
+    reversing_entry = await db.scalar(insert(models.LedgerEntry).values(
         entry_date=today,
         entry_type=original_entry.entry_type,
         debit_account_id=original_entry.credit_account_id,  # Swapped
         credit_account_id=original_entry.debit_account_id,  # Swapped
+        debit_account_code=original_entry.credit_account_code,
+        credit_account_code=original_entry.debit_account_code,
         amount=original_entry.amount,
         reference_type=original_entry.reference_type,
         reference_id=original_entry.reference_id,
         description=f"Reversal of entry {str(entry_id)}",
         notes=notes or f"Reversing entry created on {today}",
-        user_id=UUID(current_user.user_id),
-        fiscal_month=fiscal_month,
-        fiscal_year=fiscal_year,
-        reverses_entry_id=entry_id
-    )
-    db.add(reversing_entry)
+        user_id=current_user.user_uuid,
+        reverses_entry_id=original_entry.seq_id
+    ).returning(models.LedgerEntry))
 
     # Mark original as reversed
     original_entry.is_reversed = 1
 
-    db.commit()
-    db.refresh(reversing_entry)
+    await db.commit()
 
     logger.info("Ledger entry reversed", original_id=str(entry_id), reversing_id=str(reversing_entry.id))
     return LedgerEntryResponse.model_validate(reversing_entry)
@@ -353,419 +471,319 @@ async def reverse_ledger_entry(
 @app.post("/api/v1/tax-records", response_model=TaxRecordResponse, status_code=201)
 async def create_tax_record(
     tax_data: TaxRecordCreate,
+    background_tasks: BackgroundTasks,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.COMPTABLE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a tax record (TVA)"""
-    # Idempotency check
-    if tax_data.idempotency_key:
-        existing = db.query(models.TaxRecord).filter_by(
+    # Insert atomically; a duplicate idempotency key yields no row
+    tax_record = await db.scalar(
+        pg_insert(models.TaxRecord)
+        .values(
+            **tax_data.model_dump(exclude={'idempotency_key'}),
+            user_id=current_user.user_uuid,
             idempotency_key=tax_data.idempotency_key
-        ).first()
-        if existing:
-            logger.warning("Duplicate tax record ignored", idempotency_key=tax_data.idempotency_key)
-            return TaxRecordResponse.model_validate(existing)
-
-    # Calculate tax amount
-    tax_amount = int((tax_data.base_amount * tax_data.tax_rate) / 10000)
-
-    # Calculate fiscal period
-    transaction_date = datetime.strptime(tax_data.transaction_date, '%Y-%m-%d')
-    fiscal_month = transaction_date.strftime('%Y-%m')
-    fiscal_year = transaction_date.strftime('%Y')
-
-    # Create tax record
-    tax_record = models.TaxRecord(
-        **tax_data.model_dump(exclude={'idempotency_key'}),
-        tax_amount=tax_amount,
-        fiscal_month=fiscal_month,
-        fiscal_year=fiscal_year,
-        user_id=UUID(current_user.user_id),
-        idempotency_key=tax_data.idempotency_key
+        )
+        .on_conflict_do_nothing(index_elements=['idempotency_key'])
+        .returning(models.TaxRecord)
     )
-    db.add(tax_record)
-    db.commit()
-    db.refresh(tax_record)
 
-    # Publish event
+    if tax_record is None:
+        logger.warning("Duplicate tax record ignored", idempotency_key=tax_data.idempotency_key)
+        existing = await db.scalar(
+            select(models.TaxRecord).where(
+                models.TaxRecord.idempotency_key == tax_data.idempotency_key
+            )
+        )
+        return TaxRecordResponse.model_validate(existing)
+
+    await db.commit()
+
+    # Publish event after the response is sent
     if event_publisher:
-        event_publisher.publish_event(
+        background_tasks.add_task(
+            event_publisher.publish_event,
             f"tax.{tax_data.tax_type.value}",
             {
                 "tax_id": str(tax_record.id),
                 "tax_type": tax_record.tax_type.value,
                 "base_amount": tax_record.base_amount,
-                "tax_amount": tax_amount,
+                "tax_amount": tax_record.tax_amount,
                 "reference_type": tax_record.reference_type,
                 "reference_id": str(tax_record.reference_id),
-                "fiscal_month": fiscal_month
+                "fiscal_month": tax_record.fiscal_month.strftime('%Y-%m')
             }
         )
 
-    logger.info("Tax record created", tax_id=str(tax_record.id), tax_amount=tax_amount)
+    logger.info("Tax record created", tax_id=str(tax_record.id), tax_amount=tax_record.tax_amount)
     return TaxRecordResponse.model_validate(tax_record)
 
 
 @app.get("/api/v1/tax-records", response_model=List[TaxRecordResponse])
 async def list_tax_records(
     tax_type: Optional[models.TaxType] = None,
-    fiscal_month: Optional[str] = Query(None, pattern=r'^\d{4}-\d{2}$'),
+    fiscal_month: Optional[date] = Depends(fiscal_month_filter),
     reference_type: Optional[str] = None,
+    after_date: Optional[date] = None,
+    after_id: Optional[UUID] = None,
     skip: int = 0,
     limit: int = 100,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """List tax records"""
-    query = db.query(models.TaxRecord)
+    """List tax records (pass the last record's date/id as after_date/after_id for the next page)"""
+    if (after_date is None) != (after_id is None):
+        raise HTTPException(status_code=422, detail="after_date and after_id must be passed together")
+
+    stmt = lambda_stmt(lambda: select(*TAX_RECORD_COLUMNS))
 
     if tax_type:
-        query = query.filter_by(tax_type=tax_type)
+        stmt += lambda s: s.where(models.TaxRecord.tax_type == tax_type)
     if fiscal_month:
-        query = query.filter_by(fiscal_month=fiscal_month)
+        stmt += lambda s: s.where(models.TaxRecord.fiscal_month == fiscal_month)
     if reference_type:
-        query = query.filter_by(reference_type=reference_type)
+        stmt += lambda s: s.where(models.TaxRecord.reference_type == reference_type)
+    if after_date and after_id:
+        stmt += lambda s: s.where(
+            tuple_(models.TaxRecord.transaction_date, models.TaxRecord.id) < tuple_(after_date, after_id)
+        )
+
+    stmt += lambda s: s.order_by(
+        models.TaxRecord.transaction_date.desc(), models.TaxRecord.id.desc()
+    ).offset(skip).limit(limit)
 
-    records = query.order_by(models.TaxRecord.transaction_date.desc()).offset(skip).limit(limit).all()
-    return [TaxRecordResponse.model_validate(r) for r in records]
+    rows = (await db.execute(stmt)).mappings().all()
+    return Response(
+        content=TAX_RECORD_LIST_ADAPTER.dump_json([TaxRecordResponse.model_construct(**row) for row in rows]),
+        media_type="application/json"
+    )
 
 
 # ============================================
 # TVA Reports
 # ============================================
 
+TVA_MONTHLY = models.TvaMonthly.__table__.c
+IS_TVA_COLLECTEE = TVA_MONTHLY.tax_type == models.TaxType.TVA_COLLECTEE
+IS_TVA_DEDUCTIBLE = TVA_MONTHLY.tax_type == models.TaxType.TVA_DEDUCTIBLE
+
+
 @app.get("/api/v1/reports/tva/monthly", response_model=List[MonthlyTVAReport])
 async def get_monthly_tva_report(
-    fiscal_year: Optional[str] = Query(None, pattern=r'^\d{4}$'),
+    fiscal_year: Optional[int] = Depends(fiscal_year_filter),
     current_user=Depends(require_roles([Roles.ADMIN, Roles.COMPTABLE, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get monthly TVA report (collectée vs déductible)"""
-    query = db.query(
-        models.TaxRecord.fiscal_month,
-        models.TaxRecord.tax_type,
-        func.sum(models.TaxRecord.tax_amount).label('total_tax'),
-        func.count(models.TaxRecord.id).label('record_count')
-    )
+    # Pivot the per-month/per-type totals of tva_monthly
+    stmt = lambda_stmt(lambda: select(
+        TVA_MONTHLY.fiscal_month,
+        func.sum(case((IS_TVA_COLLECTEE, TVA_MONTHLY.tax_total), else_=0)).label('tva_collectee'),
+        func.sum(case((IS_TVA_DEDUCTIBLE, TVA_MONTHLY.tax_total), else_=0)).label('tva_deductible'),
+        func.sum(case((IS_TVA_COLLECTEE, TVA_MONTHLY.record_count), else_=0)).label('sales_count'),
+        func.sum(case((IS_TVA_DEDUCTIBLE, TVA_MONTHLY.record_count), else_=0)).label('purchases_count')
+    ))
 
     if fiscal_year:
-        query = query.filter(models.TaxRecord.fiscal_year == fiscal_year)
-
-    query = query.group_by(
-        models.TaxRecord.fiscal_month,
-        models.TaxRecord.tax_type
-    ).order_by(models.TaxRecord.fiscal_month.desc())
-
-    results = query.all()
-
-    # Aggregate by month
-    monthly_data = {}
-    for row in results:
-        month = row.fiscal_month
-        if month not in monthly_data:
-            monthly_data[month] = {
-                'fiscal_month': month,
-                'tva_collectee': 0,
-                'tva_deductible': 0,
-                'sales_count': 0,
-                'purchases_count': 0
-            }
-
-        if row.tax_type == models.TaxType.TVA_COLLECTEE:
-            monthly_data[month]['tva_collectee'] = int(row.total_tax)
-            monthly_data[month]['sales_count'] = row.record_count
-        elif row.tax_type == models.TaxType.TVA_DEDUCTIBLE:
-            monthly_data[month]['tva_deductible'] = int(row.total_tax)
-            monthly_data[month]['purchases_count'] = row.record_count
-
-    # Calculate net TVA
-    reports = []
-    for month, data in sorted(monthly_data.items(), reverse=True):
-        reports.append(MonthlyTVAReport(
-            fiscal_month=data['fiscal_month'],
-            tva_collectee=data['tva_collectee'],
-            tva_deductible=data['tva_deductible'],
-            tva_net=data['tva_collectee'] - data['tva_deductible'],
-            sales_count=data['sales_count'],
-            purchases_count=data['purchases_count']
-        ))
-
-    return reports
+        stmt += lambda s: s.where(TVA_MONTHLY.fiscal_year == fiscal_year)
+
+    stmt += lambda s: s.group_by(
+        TVA_MONTHLY.fiscal_month
+    ).order_by(TVA_MONTHLY.fiscal_month.desc())
+
+    results = (await db.execute(stmt)).all()
+
+    reports = [
+        MonthlyTVAReport.model_construct(
+            fiscal_month=row.fiscal_month,
+            tva_collectee=int(row.tva_collectee),
+            tva_deductible=int(row.tva_deductible),
+            tva_net=int(row.tva_collectee) - int(row.tva_deductible),
+            sales_count=int(row.sales_count),
+            purchases_count=int(row.purchases_count)
+        )
+        for row in results
+    ]
+    return Response(content=MONTHLY_TVA_LIST_ADAPTER.dump_json(reports), media_type="application/json")
 
 
 @app.get("/api/v1/reports/tva/monthly/{fiscal_month}", response_model=MonthlyTVAReport)
 async def get_monthly_tva_report_for_month(
     fiscal_month: str,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.COMPTABLE, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get TVA report for a specific month"""
     # Validate format
-    try:
-        datetime.strptime(fiscal_month, '%Y-%m')
-    except ValueError:
+    if not FISCAL_MONTH_RE.fullmatch(fiscal_month):
         raise HTTPException(status_code=400, detail="Invalid fiscal_month format. Use YYYY-MM")
+    month_start = parse_fiscal_month(fiscal_month)
 
-    # Get TVA collectée
-    tva_collectee = db.query(
-        func.coalesce(func.sum(models.TaxRecord.tax_amount), 0),
-        func.count(models.TaxRecord.id)
-    ).filter(
-        models.TaxRecord.fiscal_month == fiscal_month,
-        models.TaxRecord.tax_type == models.TaxType.TVA_COLLECTEE
-    ).first()
-
-    # Get TVA déductible
-    tva_deductible = db.query(
-        func.coalesce(func.sum(models.TaxRecord.tax_amount), 0),
-        func.count(models.TaxRecord.id)
-    ).filter(
-        models.TaxRecord.fiscal_month == fiscal_month,
-        models.TaxRecord.tax_type == models.TaxType.TVA_DEDUCTIBLE
-    ).first()
-
-    collectee_amount = int(tva_collectee[0])
-    deductible_amount = int(tva_deductible[0])
+    # tva_monthly holds at most one row per tax type for the month
+    row = (await db.execute(lambda_stmt(lambda: select(
+        func.coalesce(func.sum(TVA_MONTHLY.tax_total).filter(IS_TVA_COLLECTEE), 0),
+        func.coalesce(func.sum(TVA_MONTHLY.record_count).filter(IS_TVA_COLLECTEE), 0),
+        func.coalesce(func.sum(TVA_MONTHLY.tax_total).filter(IS_TVA_DEDUCTIBLE), 0),
+        func.coalesce(func.sum(TVA_MONTHLY.record_count).filter(IS_TVA_DEDUCTIBLE), 0)
+    ).where(
+        TVA_MONTHLY.fiscal_month == month_start
+    )))).one()
+
+    collectee_amount = int(row[0])
+    deductible_amount = int(row[2])
 
     return MonthlyTVAReport(
-        fiscal_month=fiscal_month,
+        fiscal_month=month_start,
         tva_collectee=collectee_amount,
         tva_deductible=deductible_amount,
         tva_net=collectee_amount - deductible_amount,
-        sales_count=tva_collectee[1],
-        purchases_count=tva_deductible[1]
+        sales_count=int(row[1]),
+        purchases_count=int(row[3])
     )
 
 
+LEDGER_MONTHLY = models.LedgerMonthly.__table__.c
+
+
 @app.get("/api/v1/reports/trial-balance", response_model=List[TrialBalanceEntry])
 async def get_trial_balance(
-    fiscal_year: Optional[str] = Query(None, pattern=r'^\d{4}$'),
-    fiscal_month: Optional[str] = Query(None, pattern=r'^\d{4}-\d{2}$'),
+    fiscal_year: Optional[int] = Depends(fiscal_year_filter),
+    fiscal_month: Optional[date] = Depends(fiscal_month_filter),
     current_user=Depends(require_roles([Roles.ADMIN, Roles.COMPTABLE, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get trial balance (balance de vérification)"""
-    # Query debit totals
-    debit_query = db.query(
-        models.Account.id,
-        models.Account.code,
-        models.Account.name,
-        models.Account.account_type,
-        func.coalesce(func.sum(models.LedgerEntry.amount), 0).label('debit_total')
-    ).join(
-        models.LedgerEntry,
-        models.Account.id == models.LedgerEntry.debit_account_id
-    ).filter(
-        models.LedgerEntry.is_reversed == 0
-    )
-
-    if fiscal_year:
-        debit_query = debit_query.filter(models.LedgerEntry.fiscal_year == fiscal_year)
-    if fiscal_month:
-        debit_query = debit_query.filter(models.LedgerEntry.fiscal_month == fiscal_month)
-
-    debit_query = debit_query.group_by(
-        models.Account.id,
-        models.Account.code,
-        models.Account.name,
-        models.Account.account_type
-    )
-
-    # Query credit totals
-    credit_query = db.query(
-        models.Account.id,
+    # Roll up the per-account monthly totals of ledger_monthly
+    stmt = lambda_stmt(lambda: select(
         models.Account.code,
         models.Account.name,
         models.Account.account_type,
-        func.coalesce(func.sum(models.LedgerEntry.amount), 0).label('credit_total')
+        func.sum(LEDGER_MONTHLY.debit_total).label('debit_total'),
+        func.sum(LEDGER_MONTHLY.credit_total).label('credit_total')
     ).join(
-        models.LedgerEntry,
-        models.Account.id == models.LedgerEntry.credit_account_id
-    ).filter(
-        models.LedgerEntry.is_reversed == 0
-    )
+        models.LedgerMonthly,
+        LEDGER_MONTHLY.account_id == models.Account.id
+    ))
 
     if fiscal_year:
-        credit_query = credit_query.filter(models.LedgerEntry.fiscal_year == fiscal_year)
+        stmt += lambda s: s.where(LEDGER_MONTHLY.fiscal_year == fiscal_year)
     if fiscal_month:
-        credit_query = credit_query.filter(models.LedgerEntry.fiscal_month == fiscal_month)
-
-    credit_query = credit_query.group_by(
-        models.Account.id,
-        models.Account.code,
-        models.Account.name,
-        models.Account.account_type
-    )
-
-    # Combine results
-    debit_results = {row.id: row for row in debit_query.all()}
-    credit_results = {row.id: row for row in credit_query.all()}
-
-    all_account_ids = set(debit_results.keys()) | set(credit_results.keys())
+        stmt += lambda s: s.where(LEDGER_MONTHLY.fiscal_month == fiscal_month)
 
-    trial_balance = []
-    for account_id in all_account_ids:
-        debit_row = debit_results.get(account_id)
-        credit_row = credit_results.get(account_id)
+    stmt += lambda s: s.group_by(models.Account.id).order_by(models.Account.code)
 
-        if debit_row:
-            account_code = debit_row.code
-            account_name = debit_row.name
-            account_type = debit_row.account_type
-            debit_total = int(debit_row.debit_total)
-        else:
-            account_code = credit_row.code
-            account_name = credit_row.name
-            account_type = credit_row.account_type
-            debit_total = 0
+    results = (await db.execute(stmt)).all()
 
-        credit_total = int(credit_row.credit_total) if credit_row else 0
-
-        trial_balance.append(TrialBalanceEntry(
-            account_code=account_code,
-            account_name=account_name,
-            account_type=account_type,
-            debit_total=debit_total,
-            credit_total=credit_total,
-            balance=debit_total - credit_total
-        ))
-
-    # Sort by account code
-    trial_balance.sort(key=lambda x: x.account_code)
-    return trial_balance
+    entries = [
+        TrialBalanceEntry.model_construct(
+            account_code=row.code,
+            account_name=row.name,
+            account_type=row.account_type,
+            debit_total=int(row.debit_total),
+            credit_total=int(row.credit_total),
+            balance=int(row.debit_total) - int(row.credit_total)
+        )
+        for row in results
+    ]
+    return Response(content=TRIAL_BALANCE_LIST_ADAPTER.dump_json(entries), media_type="application/json")
 
 
 # ============================================
 # Event Handlers
 # ============================================
 
-def handle_sale_created(event: EventEnvelope):
-    """Handle sale.created event - create TVA collectée record"""
-    logger.info("Handling sale.created event", event_id=event.event_id)
+# Event payloads are not schema-validated; dates must still be YYYY-MM-DD
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
 
-    with get_db_session(SessionFactory) as db:
-        try:
-            payload = event.payload
-            sale_id = payload.get('sale_id')
-            total_ht = payload.get('total_ht')  # Base amount without tax
-            transaction_date = payload.get('sale_date')
-
-            if not sale_id or not total_ht or not transaction_date:
-                logger.warning("Missing required fields in sale.created event", event_id=event.event_id)
-                return
-
-            # Calculate tax
-            tax_amount = int((total_ht * 1925) / 10000)  # 19.25%
-
-            # Calculate fiscal period
-            trans_date = datetime.strptime(transaction_date, '%Y-%m-%d')
-            fiscal_month = trans_date.strftime('%Y-%m')
-            fiscal_year = trans_date.strftime('%Y')
-
-            # Create tax record
-            tax_record = models.TaxRecord(
-                tax_type=models.TaxType.TVA_COLLECTEE,
-                base_amount=total_ht,
-                tax_rate=1925,
-                tax_amount=tax_amount,
-                reference_type='sale',
-                reference_id=UUID(sale_id),
-                transaction_date=transaction_date,
-                fiscal_month=fiscal_month,
-                fiscal_year=fiscal_year,
-                description=f"TVA collectée - Vente {sale_id}",
-                idempotency_key=f"sale_{sale_id}_tva"
-            )
-            db.add(tax_record)
-            db.commit()
 
-            logger.info("TVA collectée created for sale", sale_id=sale_id, tax_amount=tax_amount)
+def sale_tax_row(event: EventEnvelope) -> Optional[dict]:
+    """Build the TVA collectée row for a sale.created event"""
+    payload = event.payload
+    sale_id = payload.get('sale_id')
+    total_ht = payload.get('total_ht')  # Base amount without tax
+    transaction_date = payload.get('sale_date')
 
-        except Exception as e:
-            logger.error("Error handling sale.created event", error=str(e), event_id=event.event_id)
-            db.rollback()
-            raise
+    if not sale_id or not total_ht or not transaction_date:
+        logger.warning("Missing required fields in sale.created event", event_id=event.event_id)
+        return None
 
+    if not DATE_PATTERN.fullmatch(transaction_date):
+        logger.warning("Invalid date in sale.created event", event_id=event.event_id)
+        return None
 
-def handle_purchase_received(event: EventEnvelope):
-    """Handle purchase.received event - create TVA déductible record"""
-    logger.info("Handling purchase.received event", event_id=event.event_id)
+    transaction_date = date.fromisoformat(transaction_date)  # ValueError for impossible dates
 
-    with get_db_session(SessionFactory) as db:
-        try:
-            payload = event.payload
-            purchase_id = payload.get('purchase_id')
-            total_ht = payload.get('total_ht')
-            transaction_date = payload.get('purchase_date')
-
-            if not purchase_id or not total_ht or not transaction_date:
-                logger.warning("Missing required fields in purchase.received event", event_id=event.event_id)
-                return
-
-            # Calculate tax
-            tax_amount = int((total_ht * 1925) / 10000)  # 19.25%
-
-            # Calculate fiscal period
-            trans_date = datetime.strptime(transaction_date, '%Y-%m-%d')
-            fiscal_month = trans_date.strftime('%Y-%m')
-            fiscal_year = trans_date.strftime('%Y')
-
-            # Create tax record
-            tax_record = models.TaxRecord(
-                tax_type=models.TaxType.TVA_DEDUCTIBLE,
-                base_amount=total_ht,
-                tax_rate=1925,
-                tax_amount=tax_amount,
-                reference_type='purchase',
-                reference_id=UUID(purchase_id),
-                transaction_date=transaction_date,
-                fiscal_month=fiscal_month,
-                fiscal_year=fiscal_year,
-                description=f"TVA déductible - Achat {purchase_id}",
-                idempotency_key=f"purchase_{purchase_id}_tva"
-            )
-            db.add(tax_record)
-            db.commit()
-
-            logger.info("TVA déductible created for purchase", purchase_id=purchase_id, tax_amount=tax_amount)
+    return dict(
+        tax_type=models.TaxType.TVA_COLLECTEE,
+        base_amount=total_ht,
+        tax_rate=1925,  # 19.25%; tax_amount is generated by the database
+        reference_type='sale',
+        reference_id=UUID(sale_id),
+        transaction_date=transaction_date,
+        description=f"TVA collectée - Vente {sale_id}",
+        idempotency_key=f"sale_{sale_id}_tva"
+    )
 
-        except Exception as e:
-            logger.error("Error handling purchase.received event", error=str(e), event_id=event.event_id)
-            db.rollback()
-            raise
 
+def purchase_tax_row(event: EventEnvelope) -> Optional[dict]:
+    """Build the TVA déductible row for a purchase.received event"""
+    payload = event.payload
+    purchase_id = payload.get('purchase_id')
+    total_ht = payload.get('total_ht')
+    transaction_date = payload.get('purchase_date')
+
+    if not purchase_id or not total_ht or not transaction_date:
+        logger.warning("Missing required fields in purchase.received event", event_id=event.event_id)
+        return None
+
+    if not DATE_PATTERN.fullmatch(transaction_date):
+        logger.warning("Invalid date in purchase.received event", event_id=event.event_id)
+        return None
+
+    transaction_date = date.fromisoformat(transaction_date)  # ValueError for impossible dates
+
+    return dict(
+        tax_type=models.TaxType.TVA_DEDUCTIBLE,
+        base_amount=total_ht,
+        tax_rate=1925,  # 19.25%; tax_amount is generated by the database
+        reference_type='purchase',
+        reference_id=UUID(purchase_id),
+        transaction_date=transaction_date,
+        description=f"TVA déductible - Achat {purchase_id}",
+        idempotency_key=f"purchase_{purchase_id}_tva"
+    )
 
-# ============================================
-# Startup & Shutdown
-# ============================================
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize service"""
-    logger.info("Accounting service starting up")
-    if event_publisher:
-        event_publisher.connect()
+TAX_ROW_BUILDERS = {
+    "sale.created": sale_tax_row,
+    "purchase.received": purchase_tax_row,
+}
 
-    # Setup event consumer
-    if RABBITMQ_URL:
-        consumer = EventConsumer(RABBITMQ_URL, "accounting-service", "accounting_queue")
-        consumer.connect()
-        consumer.register_handler("sale.created", handle_sale_created)
-        consumer.register_handler("purchase.received", handle_purchase_received)
-        app.state.accounting_consumer = consumer
-        consumer_thread = threading.Thread(target=consumer.start_consuming, daemon=True)
-        consumer_thread.start()
-        app.state.accounting_consumer_thread = consumer_thread
 
+async def handle_tax_events(events: List[EventEnvelope]):
+    """Handle a batch of sale.created / purchase.received events - one multi-row TVA insert"""
+    rows = []
+    for event in events:
+        try:
+            row = TAX_ROW_BUILDERS[event.event_type](event)
+        except (TypeError, ValueError, AttributeError) as e:
+            # Malformed or mistyped id/date: skip it rather than fail the whole batch
+            logger.error("Invalid tax event payload", error=str(e), event_id=event.event_id)
+            continue
+        if row:
+            rows.append(row)
+
+    if not rows:
+        return
+
+    async with get_async_db_session(AsyncSessionFactory) as db:
+        await db.execute(
+            pg_insert(models.TaxRecord)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=['idempotency_key'])
+        )
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup"""
-    logger.info("Accounting service shutting down")
-    if event_publisher:
-        event_publisher.close()
-    if hasattr(app.state, "accounting_consumer"):
-        app.state.accounting_consumer.stop_consuming()
+    logger.info("TVA records created from events", events=len(events), records=len(rows))
 
 
 # ============================================
@@ -2,7 +2,10 @@
 Accounting & Tax Service Database Models
 Ledger entries (append-only), Tax records, Chart of accounts
 """
-from sqlalchemy import Column, String, Integer, Enum as SQLEnum, ForeignKey, Index, Numeric
+from sqlalchemy import (
+    BigInteger, Column, Computed, DDL, Date, Enum as SQLEnum, ForeignKey, Identity, Index, Integer, Numeric,
+    SmallInteger, String, event
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -39,6 +42,16 @@ class TaxType(str, enum.Enum):
     TVA_DEDUCTIBLE = "tva_deductible"  # VAT deductible (on purchases)
 
 
+def fiscal_month_of(date_column: str) -> Computed:
+    """Stored fiscal month (first day of the month) derived from a DATE column"""
+    return Computed(f"date_trunc('month', {date_column}::timestamp)::date", persisted=True)
+
+
+def fiscal_year_of(date_column: str) -> Computed:
+    """Stored fiscal year derived from a DATE column"""
+    return Computed(f"EXTRACT(YEAR FROM {date_column})::smallint", persisted=True)
+
+
 class Account(Base, TimestampMixin):
     """Chart of accounts"""
     __tablename__ = 'accounts'
@@ -51,10 +64,11 @@ class Account(Base, TimestampMixin):
     description = Column(String(500))
     is_active = Column(Integer, default=1)
 
-    # Relationships
-    parent_account = relationship('Account', remote_side=[id], backref='sub_accounts')
-    ledger_entries_debit = relationship('LedgerEntry', foreign_keys='LedgerEntry.debit_account_id', back_populates='debit_account')
-    ledger_entries_credit = relationship('LedgerEntry', foreign_keys='LedgerEntry.credit_account_id', back_populates='credit_account')
+    # Relationships (loaded explicitly with selectinload(); implicit loads raise)
+    parent_account = relationship('Account', remote_side=[id], back_populates='sub_accounts', lazy='raise')
+    sub_accounts = relationship('Account', back_populates='parent_account', lazy='raise')
+    ledger_entries_debit = relationship('LedgerEntry', foreign_keys='LedgerEntry.debit_account_id', back_populates='debit_account', lazy='raise')
+    ledger_entries_credit = relationship('LedgerEntry', foreign_keys='LedgerEntry.credit_account_id', back_populates='credit_account', lazy='raise')
 
 
 class LedgerEntry(Base, TimestampMixin):
@@ -65,21 +79,32 @@ class LedgerEntry(Base, TimestampMixin):
     __tablename__ = 'ledger_entries'
 
     __table_args__ = (
-        Index('idx_ledger_date', 'entry_date'),
-        Index('idx_ledger_type', 'entry_type'),
         Index('idx_ledger_reference', 'reference_type', 'reference_id'),
+        Index('idx_ledger_date_id', 'entry_date', 'id'),  # Date filters + keyset pagination
+        # Entries arrive in date order: a BRIN index covers range scans at a fraction of the size
+        Index('idx_ledger_date_brin', 'entry_date',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+        # Monthly report/list filters, index-only for the aggregated columns
+        Index('idx_ledger_report', 'fiscal_month', 'entry_type',
+              postgresql_include=['amount', 'debit_account_id', 'credit_account_id']),
     )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    entry_date = Column(String(10), nullable=False, index=True)  # YYYY-MM-DD for easy queries
-    entry_type = Column(SQLEnum(EntryType), nullable=False, index=True)
+    # Sequential internal key keeps the primary key index append-only; the API only sees the UUID id
+    seq_id = Column('seq_id', BigInteger, Identity(always=True), primary_key=True)
+    id = Column('id', UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
+    entry_date = Column(Date, nullable=False)
+    entry_type = Column(SQLEnum(EntryType), nullable=False)
 
     # Double-entry: debit and credit accounts
     debit_account_id = Column(UUID(as_uuid=True), ForeignKey('accounts.id'), nullable=False)
     credit_account_id = Column(UUID(as_uuid=True), ForeignKey('accounts.id'), nullable=False)
 
+    # Account codes as they were when the entry was posted (no join needed to display them)
+    debit_account_code = Column(String(20), nullable=False)
+    credit_account_code = Column(String(20), nullable=False)
+
     # Amount in FCFA cents (avoid float precision issues)
-    amount = Column(Integer, nullable=False)
+    amount = Column(BigInteger, nullable=False)
 
     # Reference to source transaction
     reference_type = Column(String(50))  # 'sale', 'purchase', 'payment', 'adjustment'
@@ -89,20 +114,22 @@ class LedgerEntry(Base, TimestampMixin):
     description = Column(String(500))
     notes = Column(String(1000))
     user_id = Column(UUID(as_uuid=True))  # Who created this entry
-    fiscal_month = Column(String(7), nullable=False, index=True)  # YYYY-MM for monthly reports
-    fiscal_year = Column(String(4), nullable=False, index=True)   # YYYY
+    fiscal_month = Column(Date, fiscal_month_of('entry_date'), nullable=False)  # Exposed as YYYY-MM
+    fiscal_year = Column(SmallInteger, fiscal_year_of('entry_date'), nullable=False)
 
     # Idempotency
     idempotency_key = Column(String(255), unique=True, index=True)
 
     # Reversal tracking (if this entry corrects/reverses another)
-    reverses_entry_id = Column(UUID(as_uuid=True), ForeignKey('ledger_entries.id'))
+    reverses_entry_id = Column(BigInteger, ForeignKey('ledger_entries.seq_id'))
     is_reversed = Column(Integer, default=0)  # 1 if this entry has been reversed
 
-    # Relationships
-    debit_account = relationship('Account', foreign_keys=[debit_account_id], back_populates='ledger_entries_debit')
-    credit_account = relationship('Account', foreign_keys=[credit_account_id], back_populates='ledger_entries_credit')
-    reverses_entry = relationship('LedgerEntry', remote_side=[id], backref='reversing_entries')
+    # Relationships (loaded explicitly with selectinload(); implicit loads raise)
+    debit_account = relationship('Account', foreign_keys=[debit_account_id], back_populates='ledger_entries_debit', lazy='raise')
+    credit_account = relationship('Account', foreign_keys=[credit_account_id], back_populates='ledger_entries_credit', lazy='raise')
+    reverses_entry = relationship('LedgerEntry', remote_side=[seq_id], back_populates='reversing_entries', lazy='raise')
+    reversing_entries = relationship('LedgerEntry', back_populates='reverses_entry', lazy='raise')
+    tax_records = relationship('TaxRecord', back_populates='ledger_entry', lazy='raise')
 
 
 class TaxRecord(Base, TimestampMixin):
@@ -113,31 +140,33 @@ class TaxRecord(Base, TimestampMixin):
     __tablename__ = 'tax_records'
 
     __table_args__ = (
-        Index('idx_tax_period', 'fiscal_month'),
-        Index('idx_tax_type', 'tax_type'),
         Index('idx_tax_reference', 'reference_type', 'reference_id'),
+        Index('idx_tax_date_id', 'transaction_date', 'id'),  # Date filters + keyset pagination
+        # Monthly report/list filters, index-only for the aggregated columns
+        Index('idx_tax_report', 'fiscal_month', 'tax_type',
+              postgresql_include=['base_amount', 'tax_amount']),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    tax_type = Column(SQLEnum(TaxType), nullable=False, index=True)
+    tax_type = Column(SQLEnum(TaxType), nullable=False)
 
     # Base amount (HT - hors taxes) in FCFA cents
-    base_amount = Column(Integer, nullable=False)
+    base_amount = Column(BigInteger, nullable=False)
 
     # Tax rate (stored as integer: 1925 = 19.25%)
     tax_rate = Column(Integer, nullable=False, default=1925)
 
-    # Tax amount in FCFA cents
-    tax_amount = Column(Integer, nullable=False)
+    # Tax amount in FCFA cents, computed by PostgreSQL from base and rate
+    tax_amount = Column(BigInteger, Computed('base_amount * tax_rate / 10000', persisted=True), nullable=False)
 
     # Reference to source transaction
     reference_type = Column(String(50), nullable=False)  # 'sale', 'purchase'
     reference_id = Column(UUID(as_uuid=True), nullable=False)
 
     # Fiscal period
-    transaction_date = Column(String(10), nullable=False, index=True)  # YYYY-MM-DD
-    fiscal_month = Column(String(7), nullable=False, index=True)  # YYYY-MM
-    fiscal_year = Column(String(4), nullable=False, index=True)   # YYYY
+    transaction_date = Column(Date, nullable=False)
+    fiscal_month = Column(Date, fiscal_month_of('transaction_date'), nullable=False)  # Exposed as YYYY-MM
+    fiscal_year = Column(SmallInteger, fiscal_year_of('transaction_date'), nullable=False)
 
     # Additional metadata
     description = Column(String(500))
@@ -148,7 +177,124 @@ class TaxRecord(Base, TimestampMixin):
     idempotency_key = Column(String(255), unique=True, index=True)
 
     # Linked ledger entry (if applicable)
-    ledger_entry_id = Column(UUID(as_uuid=True), ForeignKey('ledger_entries.id'))
+    ledger_entry_id = Column(BigInteger, ForeignKey('ledger_entries.seq_id'))
+
+    # Relationships (loaded explicitly with selectinload(); implicit loads raise)
+    ledger_entry = relationship('LedgerEntry', back_populates='tax_records', lazy='raise')
+
+
+# ============================================
+# Report Summaries
+# ============================================
+# Monthly totals kept current by statement-level triggers on the append-only tables,
+# in the same transaction as the write; the application never writes them.
+
+class TvaMonthly(Base):
+    """TVA totals per fiscal month and tax type"""
+    __tablename__ = 'tva_monthly'
+
+    fiscal_month = Column(Date, primary_key=True)
+    tax_type = Column(SQLEnum(TaxType), primary_key=True)
+    fiscal_year = Column(SmallInteger, nullable=False)
+    base_total = Column(BigInteger, nullable=False, default=0)
+    tax_total = Column(BigInteger, nullable=False, default=0)
+    record_count = Column(BigInteger, nullable=False, default=0)
+
 
-    # Relationships
-    ledger_entry = relationship('LedgerEntry', backref='tax_records')
+class LedgerMonthly(Base):
+    """Debit/credit totals of non-reversed entries per account and fiscal month"""
+    __tablename__ = 'ledger_monthly'
+
+    account_id = Column(UUID(as_uuid=True), primary_key=True)
+    fiscal_month = Column(Date, primary_key=True)
+    fiscal_year = Column(SmallInteger, nullable=False)
+    debit_total = Column(BigInteger, nullable=False, default=0)
+    credit_total = Column(BigInteger, nullable=False, default=0)
+    entry_count = Column(BigInteger, nullable=False, default=0)
+
+
+TAX_SUMMARY_TRIGGER_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION apply_tax_records() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO tva_monthly (fiscal_month, tax_type, fiscal_year, base_total, tax_total, record_count)
+        SELECT fiscal_month, tax_type, fiscal_year, SUM(base_amount), SUM(tax_amount), COUNT(*)
+        FROM new_records
+        GROUP BY fiscal_month, tax_type, fiscal_year
+        ON CONFLICT (fiscal_month, tax_type) DO UPDATE SET
+            base_total = tva_monthly.base_total + EXCLUDED.base_total,
+            tax_total = tva_monthly.tax_total + EXCLUDED.tax_total,
+            record_count = tva_monthly.record_count + EXCLUDED.record_count;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_tax_records_summary
+    AFTER INSERT ON tax_records
+    REFERENCING NEW TABLE AS new_records
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_tax_records()
+    """,
+)
+
+# Each entry counts on its debit and its credit account while is_reversed = 0.
+# Inserts add their rows; updates (marking an entry reversed) add the new image
+# and subtract the old one. Months left without entries are removed.
+LEDGER_DELTA_SQL = """
+        INSERT INTO ledger_monthly (account_id, fiscal_month, fiscal_year, debit_total, credit_total, entry_count)
+        SELECT account_id, fiscal_month, fiscal_year, SUM(debit), SUM(credit), SUM(entries)
+        FROM ({rows}) AS delta
+        GROUP BY account_id, fiscal_month, fiscal_year
+        ON CONFLICT (account_id, fiscal_month) DO UPDATE SET
+            debit_total = ledger_monthly.debit_total + EXCLUDED.debit_total,
+            credit_total = ledger_monthly.credit_total + EXCLUDED.credit_total,
+            entry_count = ledger_monthly.entry_count + EXCLUDED.entry_count;
+"""
+
+LEDGER_ROWS_SQL = """
+            SELECT debit_account_id AS account_id, fiscal_month, fiscal_year,
+                   {sign} * amount AS debit, 0 AS credit, {sign} AS entries
+            FROM {table} WHERE is_reversed = 0
+            UNION ALL
+            SELECT credit_account_id, fiscal_month, fiscal_year, 0, {sign} * amount, {sign}
+            FROM {table} WHERE is_reversed = 0
+"""
+
+LEDGER_SUMMARY_TRIGGER_DDL = (
+    f"""
+    CREATE OR REPLACE FUNCTION apply_ledger_entries() RETURNS trigger AS $$
+    BEGIN
+        {LEDGER_DELTA_SQL.format(rows=LEDGER_ROWS_SQL.format(sign=1, table='new_entries'))}
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION update_ledger_entries() RETURNS trigger AS $$
+    BEGIN
+        {LEDGER_DELTA_SQL.format(rows=LEDGER_ROWS_SQL.format(sign=1, table='new_entries')
+                                 + "UNION ALL"
+                                 + LEDGER_ROWS_SQL.format(sign=-1, table='old_entries'))}
+        DELETE FROM ledger_monthly WHERE entry_count = 0;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_ledger_entries_summary
+    AFTER INSERT ON ledger_entries
+    REFERENCING NEW TABLE AS new_entries
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_ledger_entries()
+    """,
+    """
+    CREATE TRIGGER trg_ledger_entries_summary_update
+    AFTER UPDATE ON ledger_entries
+    REFERENCING OLD TABLE AS old_entries NEW TABLE AS new_entries
+    FOR EACH STATEMENT EXECUTE FUNCTION update_ledger_entries()
+    """,
+)
+
+for statement in TAX_SUMMARY_TRIGGER_DDL:
+    event.listen(TaxRecord.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+for statement in LEDGER_SUMMARY_TRIGGER_DDL:
+    event.listen(LedgerEntry.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
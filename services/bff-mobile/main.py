@@ -5,13 +5,19 @@ Optimized for mobile network (1 endpoint = 1 screen)
 """
 from fastapi import FastAPI, Depends, HTTPException, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from datetime import datetime
 from uuid import UUID
+import asyncio
 import httpx
 import os
 import sys
+import time
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
@@ -28,7 +34,45 @@ FARM_SERVICE_URL = os.getenv("FARM_SERVICE_URL", "http://localhost:8002")
 INVENTORY_SERVICE_URL = os.getenv("INVENTORY_SERVICE_URL", "http://localhost:8003")
 SALES_SERVICE_URL = os.getenv("SALES_SERVICE_URL", "http://localhost:8004")
 
-app = FastAPI(title="BFF Mobile", version="1.0.0")
+SERVICE_URLS = {
+    "identity": IDENTITY_SERVICE_URL,
+    "farm": FARM_SERVICE_URL,
+    "inventory": INVENTORY_SERVICE_URL,
+    "sales": SALES_SERVICE_URL,
+}
+
+# Connection pool per downstream service. Size keep-alive connections to
+# roughly the concurrent requests one worker sends to a single service.
+HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+)
+# HTTP/2 is only negotiated over TLS (ALPN); plain http:// upstreams stay on HTTP/1.1
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+# Aggregated JSON compresses 5-10x; tiny bodies are not worth the CPU
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """One long-lived HTTP client per downstream service"""
+    app.state.http_clients = {
+        service: httpx.AsyncClient(base_url=url, timeout=10.0, limits=HTTP_LIMITS, http2=HTTP2_ENABLED)
+        for service, url in SERVICE_URLS.items()
+    }
+    yield
+    for client in app.state.http_clients.values():
+        await client.aclose()
+
+
+# orjson encodes the large aggregated payloads several times faster than stdlib json
+app = FastAPI(
+    title="BFF Mobile",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
 
 
 # ============================================
@@ -36,25 +80,47 @@ app = FastAPI(title="BFF Mobile", version="1.0.0")
 # ============================================
 
 async def make_service_request(
-    url: str,
+    service: str,
+    path: str,
     method: str = "GET",
     headers: Dict = None,
     json_data: Dict = None
 ) -> Dict[str, Any]:
     """Make HTTP request to a service"""
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=json_data
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            logger.error("Service request failed", url=url, error=str(e))
-            raise HTTPException(status_code=502, detail=f"Service unavailable: {str(e)}")
+    try:
+        response = await app.state.http_clients[service].request(
+            method=method,
+            url=path,
+            headers=headers,
+            json=json_data
+        )
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        logger.error("Service request failed", service=service, path=path, error=str(e))
+        raise HTTPException(status_code=502, detail=f"Service unavailable: {str(e)}")
+
+
+async def make_raw_service_request(
+    service: str,
+    path: str,
+    headers: Dict = None,
+    params: Dict = None
+) -> bytes:
+    """GET a service resource as undecoded JSON bytes"""
+    try:
+        response = await app.state.http_clients[service].get(path, headers=headers, params=params)
+        response.raise_for_status()
+        return response.content
+    except httpx.HTTPError as e:
+        logger.error("Service request failed", service=service, path=path, error=str(e))
+        raise HTTPException(status_code=502, detail=f"Service unavailable: {str(e)}")
+
+
+def raw_json_response(**fields: bytes) -> Response:
+    """Wrap already-encoded upstream JSON values in an object without re-parsing them"""
+    body = b",".join(b'"%s":%s' % (name.encode(), value) for name, value in fields.items())
+    return Response(content=b"{" + body + b"}", media_type="application/json")
 
 
 def get_auth_headers(credentials: HTTPAuthorizationCredentials) -> Dict[str, str]:
@@ -62,6 +128,60 @@ def get_auth_headers(credentials: HTTPAuthorizationCredentials) -> Dict[str, str
     return {"Authorization": f"Bearer {credentials.credentials}"}
 
 
+# ============================================
+# Response Cache
+# ============================================
+
+# Dashboards tolerate a few seconds of staleness; lookups like roles change rarely
+DASHBOARD_CACHE_TTL = float(os.getenv("BFF_DASHBOARD_CACHE_TTL_SECONDS", "5"))
+LOOKUP_CACHE_TTL = float(os.getenv("BFF_LOOKUP_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_MAX_SIZE = int(os.getenv("BFF_RESPONSE_CACHE_MAX_SIZE", "10000"))
+
+# (service, path, principal, raw) -> (deadline, payload)
+_response_cache: Dict[tuple, tuple] = {}
+_response_locks: Dict[tuple, asyncio.Lock] = {}
+
+
+def _prune_response_cache(now: float):
+    """Drop expired entries (and their idle locks) once the cache is full"""
+    for key in [k for k, (deadline, _) in _response_cache.items() if deadline <= now]:
+        del _response_cache[key]
+        lock = _response_locks.get(key)
+        if lock and not lock.locked():
+            del _response_locks[key]
+
+
+async def cached_get(
+    service: str,
+    path: str,
+    headers: Dict,
+    principal: str,
+    ttl: float = DASHBOARD_CACHE_TTL,
+    raw: bool = False
+) -> Any:
+    """GET a downstream resource through a per-user TTL cache; concurrent misses share one request"""
+    key = (service, path, principal, raw)
+    entry = _response_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+
+    lock = _response_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        entry = _response_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        if raw:
+            data = await make_raw_service_request(service, path, headers=headers)
+        else:
+            data = await make_service_request(service, path, headers=headers)
+        now = time.monotonic()
+        if len(_response_cache) >= RESPONSE_CACHE_MAX_SIZE:
+            _prune_response_cache(now)
+        _response_cache[key] = (now + ttl, data)
+        return data
+
+
 # ============================================
 # Mobile Screen Endpoints
 # ============================================
@@ -85,41 +205,23 @@ async def get_home_screen(
     Mobile home screen - aggregates data from multiple services
     Returns: User info + dashboard metrics
     """
-    # Get user info
-    user_data = await make_service_request(
-        f"{IDENTITY_SERVICE_URL}/api/v1/users/me",
-        headers=get_auth_headers(credentials)
-    )
-
-    # Get farm counts
-    farms = await make_service_request(
-        f"{FARM_SERVICE_URL}/api/v1/farms?limit=1000",
-        headers=get_auth_headers(credentials)
-    )
-
-    plots = await make_service_request(
-        f"{FARM_SERVICE_URL}/api/v1/plots?limit=1000",
-        headers=get_auth_headers(credentials)
-    )
-
-    # Get inventory alerts
-    low_stock = await make_service_request(
-        f"{INVENTORY_SERVICE_URL}/api/v1/stock-levels?below_minimum=true",
-        headers=get_auth_headers(credentials)
-    )
-
-    # Get sales data
-    sales = await make_service_request(
-        f"{SALES_SERVICE_URL}/api/v1/sales?status=PENDING&limit=100",
-        headers=get_auth_headers(credentials)
+    headers = get_auth_headers(credentials)
+
+    # User info and counts computed by each service, fetched concurrently
+    user_data, farms, plots, low_stock, sales = await asyncio.gather(
+        cached_get("identity", "/api/v1/users/me", headers, current_user.user_id),
+        cached_get("farm", "/api/v1/farms/count", headers, current_user.user_id),
+        cached_get("farm", "/api/v1/plots/count", headers, current_user.user_id),
+        cached_get("inventory", "/api/v1/stock-levels/count?below_minimum=true", headers, current_user.user_id),
+        cached_get("sales", "/api/v1/sales/count?status=pending", headers, current_user.user_id)
     )
 
     return HomeScreenData(
         user_name=user_data.get("full_name", user_data.get("username")),
-        farms_count=len(farms) if isinstance(farms, list) else 0,
-        plots_count=len(plots) if isinstance(plots, list) else 0,
-        low_stock_count=len(low_stock) if isinstance(low_stock, list) else 0,
-        pending_sales_count=len(sales) if isinstance(sales, list) else 0,
+        farms_count=farms.get("count", 0),
+        plots_count=plots.get("count", 0),
+        low_stock_count=low_stock.get("count", 0),
+        pending_sales_count=sales.get("count", 0),
         today_sales_total=0  # Would calculate from sales data
     )
 
@@ -134,23 +236,16 @@ async def get_plot_overview(
     Plot overview screen - all data needed for plot details
     Returns: Plot info + season + recent operations
     """
-    # Get plot details
-    plot = await make_service_request(
-        f"{FARM_SERVICE_URL}/api/v1/plots/{plot_id}",
-        headers=get_auth_headers(credentials)
-    )
+    headers = get_auth_headers(credentials)
 
-    # Get farm details
-    farm = await make_service_request(
-        f"{FARM_SERVICE_URL}/api/v1/farms/{plot['farm_id']}",
-        headers=get_auth_headers(credentials)
+    # Plot details and current season are independent
+    plot, seasons = await asyncio.gather(
+        cached_get("farm", f"/api/v1/plots/{plot_id}", headers, current_user.user_id),
+        cached_get("farm", "/api/v1/seasons?status=active&limit=1", headers, current_user.user_id)
     )
 
-    # Get current season
-    seasons = await make_service_request(
-        f"{FARM_SERVICE_URL}/api/v1/seasons?status=active&limit=1",
-        headers=get_auth_headers(credentials)
-    )
+    # Farm details need the plot's farm_id
+    farm = await cached_get("farm", f"/api/v1/farms/{plot['farm_id']}", headers, current_user.user_id)
 
     return {
         "plot": plot,
@@ -166,12 +261,12 @@ async def get_low_stock_mobile(
     credentials: HTTPAuthorizationCredentials = Security(bearer_scheme)
 ):
     """Mobile-optimized low stock screen"""
-    stock_levels = await make_service_request(
-        f"{INVENTORY_SERVICE_URL}/api/v1/stock-levels?below_minimum=true",
-        headers=get_auth_headers(credentials)
+    stock_levels = await cached_get(
+        "inventory", "/api/v1/stock-levels?below_minimum=true",
+        get_auth_headers(credentials), current_user.user_id, raw=True
     )
 
-    return {"low_stock_items": stock_levels}
+    return raw_json_response(low_stock_items=stock_levels)
 
 
 @app.post("/m/sales/quick-create")
@@ -186,7 +281,7 @@ async def quick_create_sale(
     """
     # Create sale via Sales Service
     sale = await make_service_request(
-        f"{SALES_SERVICE_URL}/api/v1/sales",
+        "sales", "/api/v1/sales",
         method="POST",
         headers=get_auth_headers(credentials),
         json_data=sale_data
@@ -215,6 +310,24 @@ async def sync_pull(
     }
 
 
+# Offline action type -> (service, bulk endpoint, payload key)
+SYNC_BULK_ROUTES = {
+    "stock_movement": ("inventory", "/api/v1/stock-movements/bulk", "movements"),
+}
+
+
+async def push_action_group(action_type: str, actions: List[Dict[str, Any]], headers: Dict) -> int:
+    """Send every offline action of one type in a single bulk request"""
+    service, path, payload_key = SYNC_BULK_ROUTES[action_type]
+    await make_service_request(
+        service, path,
+        method="POST",
+        headers=headers,
+        json_data={payload_key: [action.get("data", {}) for action in actions]}
+    )
+    return len(actions)
+
+
 @app.post("/m/sync/push")
 async def sync_push(
     sync_data: Dict[str, Any],
@@ -225,17 +338,30 @@ async def sync_push(
     Push local changes for offline sync
     Processes batch of actions created offline
     """
-    # This would process offline actions and sync them
     processed = 0
     errors = []
 
-    # Process each action with idempotency
+    # Group actions by type; idempotency keys travel inside each action's data
+    groups = defaultdict(list)
     for action in sync_data.get("actions", []):
-        try:
-            # Route to appropriate service based on action type
-            processed += 1
-        except Exception as e:
-            errors.append({"action_id": action.get("id"), "error": str(e)})
+        if action.get("type") in SYNC_BULK_ROUTES:
+            groups[action["type"]].append(action)
+        else:
+            errors.append({"action_id": action.get("id"), "error": f"Unsupported action type: {action.get('type')}"})
+
+    # One bulk request per action type, all types in parallel
+    headers = get_auth_headers(credentials)
+    results = await asyncio.gather(
+        *(push_action_group(action_type, actions, headers) for action_type, actions in groups.items()),
+        return_exceptions=True
+    )
+
+    for actions, result in zip(groups.values(), results):
+        if isinstance(result, Exception):
+            error = getattr(result, "detail", None) or str(result)
+            errors.extend({"action_id": action.get("id"), "error": error} for action in actions)
+        else:
+            processed += result
 
     return {
         "processed": processed,
@@ -5,13 +5,18 @@ Optimized for admin/back-office use
 """
 from fastapi import FastAPI, Depends, HTTPException, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+from contextlib import asynccontextmanager
 from datetime import datetime, date
 from uuid import UUID
+import asyncio
 import httpx
 import os
 import sys
+import time
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
@@ -30,7 +35,47 @@ SALES_SERVICE_URL = os.getenv("SALES_SERVICE_URL", "http://localhost:8004")
 ACCOUNTING_SERVICE_URL = os.getenv("ACCOUNTING_SERVICE_URL", "http://localhost:8005")
 REPORTING_SERVICE_URL = os.getenv("REPORTING_SERVICE_URL", "http://localhost:8006")
 
-app = FastAPI(title="BFF Web", version="1.0.0")
+SERVICE_URLS = {
+    "identity": IDENTITY_SERVICE_URL,
+    "farm": FARM_SERVICE_URL,
+    "inventory": INVENTORY_SERVICE_URL,
+    "sales": SALES_SERVICE_URL,
+    "accounting": ACCOUNTING_SERVICE_URL,
+    "reporting": REPORTING_SERVICE_URL,
+}
+
+# Connection pool per downstream service. Size keep-alive connections to
+# roughly the concurrent requests one worker sends to a single service.
+HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+)
+# HTTP/2 is only negotiated over TLS (ALPN); plain http:// upstreams stay on HTTP/1.1
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+# Aggregated JSON compresses 5-10x; tiny bodies are not worth the CPU
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """One long-lived HTTP client per downstream service"""
+    app.state.http_clients = {
+        service: httpx.AsyncClient(base_url=url, timeout=15.0, limits=HTTP_LIMITS, http2=HTTP2_ENABLED)
+        for service, url in SERVICE_URLS.items()
+    }
+    yield
+    for client in app.state.http_clients.values():
+        await client.aclose()
+
+
+# orjson encodes the large aggregated payloads several times faster than stdlib json
+app = FastAPI(
+    title="BFF Web",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
 
 
 # ============================================
@@ -38,25 +83,49 @@ app = FastAPI(title="BFF Web", version="1.0.0")
 # ============================================
 
 async def make_service_request(
-    url: str,
+    service: str,
+    path: str,
     method: str = "GET",
     headers: Dict = None,
-    json_data: Dict = None
+    json_data: Dict = None,
+    params: Dict = None
 ) -> Dict[str, Any]:
     """Make HTTP request to a service"""
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=json_data
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            logger.error("Service request failed", url=url, error=str(e))
-            raise HTTPException(status_code=502, detail=f"Service unavailable: {str(e)}")
+    try:
+        response = await app.state.http_clients[service].request(
+            method=method,
+            url=path,
+            headers=headers,
+            json=json_data,
+            params=params
+        )
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        logger.error("Service request failed", service=service, path=path, error=str(e))
+        raise HTTPException(status_code=502, detail=f"Service unavailable: {str(e)}")
+
+
+async def make_raw_service_request(
+    service: str,
+    path: str,
+    headers: Dict = None,
+    params: Dict = None
+) -> bytes:
+    """GET a service resource as undecoded JSON bytes"""
+    try:
+        response = await app.state.http_clients[service].get(path, headers=headers, params=params)
+        response.raise_for_status()
+        return response.content
+    except httpx.HTTPError as e:
+        logger.error("Service request failed", service=service, path=path, error=str(e))
+        raise HTTPException(status_code=502, detail=f"Service unavailable: {str(e)}")
+
+
+def raw_json_response(**fields: bytes) -> Response:
+    """Wrap already-encoded upstream JSON values in an object without re-parsing them"""
+    body = b",".join(b'"%s":%s' % (name.encode(), value) for name, value in fields.items())
+    return Response(content=b"{" + body + b"}", media_type="application/json")
 
 
 def get_auth_headers(credentials: HTTPAuthorizationCredentials) -> Dict[str, str]:
@@ -64,6 +133,56 @@ def get_auth_headers(credentials: HTTPAuthorizationCredentials) -> Dict[str, str
     return {"Authorization": f"Bearer {credentials.credentials}"}
 
 
+# ============================================
+# Response Cache
+# ============================================
+
+# Dashboards tolerate a few seconds of staleness; lookups like roles change rarely
+DASHBOARD_CACHE_TTL = float(os.getenv("BFF_DASHBOARD_CACHE_TTL_SECONDS", "5"))
+LOOKUP_CACHE_TTL = float(os.getenv("BFF_LOOKUP_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_MAX_SIZE = int(os.getenv("BFF_RESPONSE_CACHE_MAX_SIZE", "10000"))
+
+# (service, path, principal) -> (deadline, payload)
+_response_cache: Dict[tuple, tuple] = {}
+_response_locks: Dict[tuple, asyncio.Lock] = {}
+
+
+def _prune_response_cache(now: float):
+    """Drop expired entries (and their idle locks) once the cache is full"""
+    for key in [k for k, (deadline, _) in _response_cache.items() if deadline <= now]:
+        del _response_cache[key]
+        lock = _response_locks.get(key)
+        if lock and not lock.locked():
+            del _response_locks[key]
+
+
+async def cached_get(
+    service: str,
+    path: str,
+    headers: Dict,
+    principal: str,
+    ttl: float = DASHBOARD_CACHE_TTL
+) -> Any:
+    """GET a downstream resource through a per-user TTL cache; concurrent misses share one request"""
+    key = (service, path, principal)
+    entry = _response_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+
+    lock = _response_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        entry = _response_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        data = await make_service_request(service, path, headers=headers)
+        now = time.monotonic()
+        if len(_response_cache) >= RESPONSE_CACHE_MAX_SIZE:
+            _prune_response_cache(now)
+        _response_cache[key] = (now + ttl, data)
+        return data
+
+
 # ============================================
 # Dashboard Endpoints
 # ============================================
@@ -85,44 +204,23 @@ async def get_dashboard(
     """
     Complete web dashboard with aggregated data from all services
     """
-    # Get dashboard summary from reporting service
-    try:
-        summary = await make_service_request(
-            f"{REPORTING_SERVICE_URL}/api/v1/dashboard",
-            headers=get_auth_headers(credentials)
-        )
-    except:
-        summary = {"sales_today": 0, "sales_month": 0, "inventory_value": 0}
-
-    # Get recent sales
-    try:
-        sales = await make_service_request(
-            f"{SALES_SERVICE_URL}/api/v1/sales?limit=10",
-            headers=get_auth_headers(credentials)
-        )
-        recent_sales = sales if isinstance(sales, list) else []
-    except:
-        recent_sales = []
-
-    # Get low stock items
-    try:
-        low_stock = await make_service_request(
-            f"{INVENTORY_SERVICE_URL}/api/v1/stock-levels?below_minimum=true&limit=10",
-            headers=get_auth_headers(credentials)
-        )
-        low_stock_items = low_stock if isinstance(low_stock, list) else []
-    except:
-        low_stock_items = []
+    headers = get_auth_headers(credentials)
+    current_month = datetime.now().strftime("%Y-%m")
+
+    # Fetch all sections concurrently; a failed section falls back to its default
+    summary, sales, low_stock, tva_summary = await asyncio.gather(
+        cached_get("reporting", "/api/v1/dashboard", headers, current_user.user_id),
+        cached_get("sales", "/api/v1/sales?limit=10", headers, current_user.user_id),
+        cached_get("inventory", "/api/v1/stock-levels?below_minimum=true&limit=10", headers, current_user.user_id),
+        cached_get("accounting", f"/api/v1/reports/tva/monthly/{current_month}", headers, current_user.user_id),
+        return_exceptions=True
+    )
 
-    # Get TVA summary (current month)
-    try:
-        tva_data = await make_service_request(
-            f"{ACCOUNTING_SERVICE_URL}/api/v1/reports/tva/monthly",
-            headers=get_auth_headers(credentials)
-        )
-        current_month = datetime.now().strftime("%Y%m")
-        tva_summary = next((t for t in tva_data if t.get("fiscal_month") == current_month), {})
-    except:
+    if isinstance(summary, Exception):
+        summary = {"sales_today": 0, "sales_month": 0, "inventory_value": 0}
+    recent_sales = sales if isinstance(sales, list) else []
+    low_stock_items = low_stock if isinstance(low_stock, list) else []
+    if isinstance(tva_summary, Exception):
         tva_summary = {}
 
     return DashboardData(
@@ -143,16 +241,12 @@ async def get_inventory_overview(
     Inventory overview for web admin
     Returns: Stock levels + alerts + valuation
     """
-    # Get all stock levels
-    stock_levels = await make_service_request(
-        f"{INVENTORY_SERVICE_URL}/api/v1/stock-levels",
-        headers=get_auth_headers(credentials)
-    )
+    headers = get_auth_headers(credentials)
 
-    # Get recent movements
-    movements = await make_service_request(
-        f"{INVENTORY_SERVICE_URL}/api/v1/stock-movements?limit=50",
-        headers=get_auth_headers(credentials)
+    # All stock levels and recent movements
+    stock_levels, movements = await asyncio.gather(
+        cached_get("inventory", "/api/v1/stock-levels", headers, current_user.user_id),
+        cached_get("inventory", "/api/v1/stock-movements?limit=50", headers, current_user.user_id)
     )
 
     # Calculate inventory value
@@ -188,25 +282,13 @@ async def get_sales_analytics(
     if end_date:
         params["to_date"] = end_date.isoformat()
 
-    # Get sales data
-    sales = await make_service_request(
-        f"{SALES_SERVICE_URL}/api/v1/sales?" + "&".join([f"{k}={v}" for k, v in params.items()]),
-        headers=get_auth_headers(credentials)
+    # Totals, daily series and top lists are aggregated by the sales service
+    return await make_service_request(
+        "sales", "/api/v1/sales/analytics",
+        headers=get_auth_headers(credentials),
+        params=params
     )
 
-    # Analyze sales data
-    total_sales = len(sales) if isinstance(sales, list) else 0
-    total_amount = sum([s.get("total_amount", 0) for s in sales]) if isinstance(sales, list) else 0
-
-    return {
-        "total_sales": total_sales,
-        "total_amount": total_amount,
-        "average_sale": total_amount / total_sales if total_sales > 0 else 0,
-        "sales_by_day": [],  # Would group by date
-        "top_customers": [],  # Would aggregate by customer
-        "top_products": []   # Would aggregate by product
-    }
-
 
 @app.get("/w/accounting/overview")
 async def get_accounting_overview(
@@ -217,37 +299,20 @@ async def get_accounting_overview(
     Accounting overview for web admin
     Returns: Trial balance + TVA + recent entries
     """
-    # Get trial balance
-    try:
-        trial_balance = await make_service_request(
-            f"{ACCOUNTING_SERVICE_URL}/api/v1/reports/trial-balance",
-            headers=get_auth_headers(credentials)
-        )
-    except:
-        trial_balance = []
-
-    # Get TVA reports
-    try:
-        tva_reports = await make_service_request(
-            f"{ACCOUNTING_SERVICE_URL}/api/v1/reports/tva/monthly",
-            headers=get_auth_headers(credentials)
-        )
-    except:
-        tva_reports = []
-
-    # Get recent ledger entries
-    try:
-        ledger_entries = await make_service_request(
-            f"{ACCOUNTING_SERVICE_URL}/api/v1/ledger-entries?limit=20",
-            headers=get_auth_headers(credentials)
-        )
-    except:
-        ledger_entries = []
+    headers = get_auth_headers(credentials)
+
+    # Trial balance, TVA reports and recent entries; a failed call yields an empty list
+    trial_balance, tva_reports, ledger_entries = await asyncio.gather(
+        cached_get("accounting", "/api/v1/reports/trial-balance", headers, current_user.user_id),
+        cached_get("accounting", "/api/v1/reports/tva/monthly", headers, current_user.user_id),
+        cached_get("accounting", "/api/v1/ledger-entries?limit=20", headers, current_user.user_id),
+        return_exceptions=True
+    )
 
     return {
-        "trial_balance": trial_balance,
-        "tva_reports": tva_reports,
-        "recent_entries": ledger_entries
+        "trial_balance": [] if isinstance(trial_balance, Exception) else trial_balance,
+        "tva_reports": [] if isinstance(tva_reports, Exception) else tva_reports,
+        "recent_entries": [] if isinstance(ledger_entries, Exception) else ledger_entries
     }
 
 
@@ -259,26 +324,17 @@ async def get_farms_overview(
     """
     Farms and plots overview for web admin
     """
-    # Get all farms
-    farms = await make_service_request(
-        f"{FARM_SERVICE_URL}/api/v1/farms",
-        headers=get_auth_headers(credentials)
-    )
-
-    # Get all plots
-    plots = await make_service_request(
-        f"{FARM_SERVICE_URL}/api/v1/plots",
-        headers=get_auth_headers(credentials)
-    )
+    headers = get_auth_headers(credentials)
 
-    # Get active seasons
-    seasons = await make_service_request(
-        f"{FARM_SERVICE_URL}/api/v1/seasons?status=active",
-        headers=get_auth_headers(credentials)
+    # All farms, all plots and active seasons
+    farms, plots, seasons = await asyncio.gather(
+        cached_get("farm", "/api/v1/farms", headers, current_user.user_id),
+        cached_get("farm", "/api/v1/plots", headers, current_user.user_id),
+        cached_get("farm", "/api/v1/seasons?status=active", headers, current_user.user_id)
     )
 
     # Calculate total area
-    total_area = sum([f.get("total_area", 0) for f in farms]) if isinstance(farms, list) else 0
+    total_area = sum([f.get("total_area") or 0 for f in farms]) if isinstance(farms, list) else 0
 
     return {
         "farms": farms,
@@ -304,7 +360,7 @@ async def generate_report(
     Delegates to Reporting Service
     """
     report = await make_service_request(
-        f"{REPORTING_SERVICE_URL}/api/v1/reports",
+        "reporting", "/api/v1/reports",
         method="POST",
         headers=get_auth_headers(credentials),
         json_data=report_request
@@ -320,14 +376,15 @@ async def list_reports(
     credentials: HTTPAuthorizationCredentials = Security(bearer_scheme)
 ):
     """List generated reports"""
-    params = f"?report_type={report_type}" if report_type else ""
+    params = {"report_type": report_type} if report_type else None
 
-    reports = await make_service_request(
-        f"{REPORTING_SERVICE_URL}/api/v1/reports{params}",
-        headers=get_auth_headers(credentials)
+    reports = await make_raw_service_request(
+        "reporting", "/api/v1/reports",
+        headers=get_auth_headers(credentials),
+        params=params
     )
 
-    return {"reports": reports}
+    return raw_json_response(reports=reports)
 
 
 @app.get("/w/users/management")
@@ -339,16 +396,12 @@ async def get_users_management(
     User management overview
     Returns: All users + roles + permissions
     """
-    # Get all users
-    users = await make_service_request(
-        f"{IDENTITY_SERVICE_URL}/api/v1/users",
-        headers=get_auth_headers(credentials)
-    )
+    headers = get_auth_headers(credentials)
 
-    # Get all roles
-    roles = await make_service_request(
-        f"{IDENTITY_SERVICE_URL}/api/v1/roles",
-        headers=get_auth_headers(credentials)
+    # All users and all roles
+    users, roles = await asyncio.gather(
+        cached_get("identity", "/api/v1/users", headers, current_user.user_id),
+        cached_get("identity", "/api/v1/roles", headers, current_user.user_id, LOOKUP_CACHE_TTL)
     )
 
     return {
@@ -2,52 +2,97 @@
 Farm Service
 Farm structure management: Farms, Plots, Seasons, Crop Types
 """
-from fastapi import FastAPI, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import FastAPI, Depends, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.routing import Route
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, text, update
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
-from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
+import asyncio
 import os
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from shared.database import create_db_engine, get_session_factory, get_db_session, Base
+from shared.database import (
+    create_async_db_engine,
+    get_async_session_factory,
+    get_async_db_session,
+    Base
+)
 from shared.auth import get_current_user, require_roles, Roles
 from shared.logging_config import configure_logging
-from shared.events import EventPublisher
+from shared.events import EventPublisher, QueuedEventPublisher
 
 import models
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 # Initialize logging
 logger = configure_logging("farm-service")
 
 # Database setup
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_db_engine(DATABASE_URL)
-SessionFactory = get_session_factory(engine)
+async_engine = create_async_db_engine(DATABASE_URL)
+AsyncSessionFactory = get_async_session_factory(async_engine)
 
-# Create tables (dev only; prefer migrations in prod)
-if os.getenv("AUTO_CREATE_DB", "true").lower() == "true":
-    Base.metadata.create_all(bind=engine)
+# List paging: page size is capped; full dumps go through the streaming export
+MAX_LIST_LIMIT = int(os.getenv("MAX_LIST_LIMIT", "500"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "100"))
 
-# Event publisher
+# Event publisher (queued; a background task publishes off the request path)
 RABBITMQ_URL = os.getenv("RABBITMQ_URL")
-event_publisher = EventPublisher(RABBITMQ_URL, "farm-service") if RABBITMQ_URL else None
+event_publisher = (
+    QueuedEventPublisher(EventPublisher(RABBITMQ_URL, "farm-service")) if RABBITMQ_URL else None
+)
+
+
+async def seed_crop_types():
+    """Create default crop types in their own session"""
+    async with get_async_db_session(AsyncSessionFactory) as db:
+        await create_default_crop_types(db)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize service on startup and cleanup on shutdown"""
+    logger.info("Farm service starting up")
+    # Create tables (dev only; prefer migrations in prod)
+    if os.getenv("AUTO_CREATE_DB", "true").lower() == "true":
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    # Broker connect and crop type seeding are independent; overlap them
+    startup = [seed_crop_types()]
+    if event_publisher:
+        startup.append(event_publisher.start())
+    await asyncio.gather(*startup)
+
+    yield
+
+    logger.info("Farm service shutting down")
+    if event_publisher:
+        await event_publisher.close()
+    await async_engine.dispose()
+
 
 # FastAPI app
 app = FastAPI(
     title="Farm Service",
     description="Farm structure management microservice",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
 # Dependency to get database session
-def get_db():
-    with get_db_session(SessionFactory) as session:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_db_session(AsyncSessionFactory) as session:
         yield session
 
 
@@ -60,7 +105,7 @@ class FarmCreate(BaseModel):
     code: str
     description: Optional[str] = None
     location: Optional[str] = None
-    total_area: Optional[Decimal] = None
+    total_area: Optional[float] = None
     owner_name: Optional[str] = None
     contact_phone: Optional[str] = None
     contact_email: Optional[str] = None
@@ -70,7 +115,7 @@ class FarmUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     location: Optional[str] = None
-    total_area: Optional[Decimal] = None
+    total_area: Optional[float] = None
     owner_name: Optional[str] = None
     contact_phone: Optional[str] = None
     contact_email: Optional[str] = None
@@ -85,7 +130,7 @@ class FarmResponse(BaseModel):
     code: str
     description: Optional[str]
     location: Optional[str]
-    total_area: Optional[Decimal]
+    total_area: Optional[float]
     owner_name: Optional[str]
     contact_phone: Optional[str]
     contact_email: Optional[str]
@@ -98,7 +143,7 @@ class PlotCreate(BaseModel):
     code: str
     name: str
     description: Optional[str] = None
-    area: Decimal
+    area: float
     soil_type: Optional[str] = None
     irrigation_available: bool = False
     crop_type_id: Optional[UUID] = None
@@ -108,7 +153,7 @@ class PlotCreate(BaseModel):
 class PlotUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
-    area: Optional[Decimal] = None
+    area: Optional[float] = None
     soil_type: Optional[str] = None
     irrigation_available: Optional[bool] = None
     crop_type_id: Optional[UUID] = None
@@ -124,7 +169,7 @@ class PlotResponse(BaseModel):
     code: str
     name: str
     description: Optional[str]
-    area: Decimal
+    area: float
     soil_type: Optional[str]
     irrigation_available: bool
     crop_type_id: Optional[UUID]
@@ -140,16 +185,16 @@ class SeasonCreate(BaseModel):
     description: Optional[str] = None
     year: int
     season_number: Optional[int] = None
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
     status: str = "planned"
 
 
 class SeasonUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
     status: Optional[str] = None
     is_active: Optional[bool] = None
 
@@ -164,8 +209,8 @@ class SeasonResponse(BaseModel):
     description: Optional[str]
     year: int
     season_number: Optional[int]
-    start_date: Optional[str]
-    end_date: Optional[str]
+    start_date: Optional[date]
+    end_date: Optional[date]
     status: str
     is_active: bool
     created_at: datetime
@@ -176,7 +221,7 @@ class CropTypeCreate(BaseModel):
     name: str
     description: Optional[str] = None
     category: Optional[str] = None
-    typical_yield_per_ha: Optional[Decimal] = None
+    typical_yield_per_ha: Optional[float] = None
     typical_cycle_days: Optional[int] = None
     unit: str = "kg"
 
@@ -185,7 +230,7 @@ class CropTypeUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     category: Optional[str] = None
-    typical_yield_per_ha: Optional[Decimal] = None
+    typical_yield_per_ha: Optional[float] = None
     typical_cycle_days: Optional[int] = None
     unit: Optional[str] = None
     is_active: Optional[bool] = None
@@ -199,45 +244,58 @@ class CropTypeResponse(BaseModel):
     name: str
     description: Optional[str]
     category: Optional[str]
-    typical_yield_per_ha: Optional[Decimal]
+    typical_yield_per_ha: Optional[float]
     typical_cycle_days: Optional[int]
     unit: str
     is_active: bool
     created_at: datetime
 
 
-# ============================================
-# Startup/Shutdown Events
-# ============================================
+class CountResponse(BaseModel):
+    count: int
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize service on startup"""
-    logger.info("Farm service starting up")
-    if event_publisher:
-        event_publisher.connect()
 
-    # Create default crop types
-    with get_db_session(SessionFactory) as db:
-        create_default_crop_types(db)
+def response_columns(model, schema) -> list:
+    """Columns backing a response schema, in field order"""
+    return [getattr(model, name) for name in schema.model_fields]
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("Farm service shutting down")
-    if event_publisher:
-        event_publisher.close()
+# List endpoints select plain rows and skip ORM instances and re-validation
+FARM_COLUMNS = response_columns(models.Farm, FarmResponse)
+PLOT_COLUMNS = response_columns(models.Plot, PlotResponse)
+SEASON_COLUMNS = response_columns(models.Season, SeasonResponse)
+CROP_TYPE_COLUMNS = response_columns(models.CropType, CropTypeResponse)
+
+# Serializers built once; list handlers return JSON bytes directly
+FARM_LIST_ADAPTER = TypeAdapter(List[FarmResponse])
+PLOT_LIST_ADAPTER = TypeAdapter(List[PlotResponse])
+SEASON_LIST_ADAPTER = TypeAdapter(List[SeasonResponse])
+CROP_TYPE_LIST_ADAPTER = TypeAdapter(List[CropTypeResponse])
+PLOT_ADAPTER = TypeAdapter(PlotResponse)
+
+
+# ============================================
+# Reference Data
+# ============================================
+
+# Any constant works as long as no other code path uses it as an advisory lock key
+CROP_TYPE_SEED_LOCK_ID = 918273645
 
 
-def create_default_crop_types(db: Session):
+async def create_default_crop_types(db: AsyncSession):
     """Create default crop types reference data"""
+    # One worker seeds; the others skip instead of queueing on the same rows.
+    # The transaction-level lock is released by the commit below.
+    if not await db.scalar(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": CROP_TYPE_SEED_LOCK_ID}):
+        logger.info("Crop type seeding running in another worker, skipping")
+        return
+
     default_crops = [
         {
             "code": "MAIS",
             "name": "Maïs",
             "category": "cereals",
-            "typical_yield_per_ha": Decimal("3000"),
+            "typical_yield_per_ha": 3000.0,
             "typical_cycle_days": 120,
             "unit": "kg"
         },
@@ -245,7 +303,7 @@ def create_default_crop_types(db: Session):
             "code": "RIZ",
             "name": "Riz",
             "category": "cereals",
-            "typical_yield_per_ha": Decimal("4000"),
+            "typical_yield_per_ha": 4000.0,
             "typical_cycle_days": 150,
             "unit": "kg"
         },
@@ -253,7 +311,7 @@ def create_default_crop_types(db: Session):
             "code": "TOMATE",
             "name": "Tomate",
             "category": "vegetables",
-            "typical_yield_per_ha": Decimal("25000"),
+            "typical_yield_per_ha": 25000.0,
             "typical_cycle_days": 90,
             "unit": "kg"
         },
@@ -261,7 +319,7 @@ def create_default_crop_types(db: Session):
             "code": "MANIOC",
             "name": "Manioc",
             "category": "tubers",
-            "typical_yield_per_ha": Decimal("15000"),
+            "typical_yield_per_ha": 15000.0,
             "typical_cycle_days": 300,
             "unit": "kg"
         },
@@ -269,19 +327,36 @@ def create_default_crop_types(db: Session):
             "code": "HARICOT",
             "name": "Haricot",
             "category": "legumes",
-            "typical_yield_per_ha": Decimal("1500"),
+            "typical_yield_per_ha": 1500.0,
             "typical_cycle_days": 75,
             "unit": "kg"
         },
     ]
 
-    for crop_data in default_crops:
-        existing = db.query(models.CropType).filter_by(code=crop_data["code"]).first()
-        if not existing:
-            crop = models.CropType(**crop_data)
-            db.add(crop)
+    # One statement for all crops; codes already present are skipped by the unique index
+    await db.execute(
+        pg_insert(models.CropType)
+        .values(default_crops)
+        .on_conflict_do_nothing(index_elements=['code'])
+    )
+    await db.commit()
+
+
+# Foreign key constraint suffix -> detail for a missing referenced row
+FK_NOT_FOUND_DETAILS = {
+    "_farm_id_fkey": "Farm not found",
+    "_crop_type_id_fkey": "Crop type not found",
+    "_current_season_id_fkey": "Season not found",
+}
+
 
-    db.commit()
+def foreign_key_not_found(error: IntegrityError) -> HTTPException:
+    """Map a foreign key violation to a 404 for the referenced row"""
+    message = str(error.orig)
+    for suffix, detail in FK_NOT_FOUND_DETAILS.items():
+        if f'{suffix}"' in message:
+            return HTTPException(status_code=404, detail=detail)
+    raise error
 
 
 # ============================================
@@ -292,17 +367,19 @@ def create_default_crop_types(db: Session):
 async def create_farm(
     farm_data: FarmCreate,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new farm"""
-    # Check if code already exists
-    if db.query(models.Farm).filter_by(code=farm_data.code).first():
+    # The unique code index rejects duplicates; no RETURNING row means the code exists
+    farm = await db.scalar(
+        pg_insert(models.Farm)
+        .values(**farm_data.model_dump())
+        .on_conflict_do_nothing(index_elements=['code'])
+        .returning(models.Farm)
+    )
+    if farm is None:
         raise HTTPException(status_code=400, detail="Farm code already exists")
-
-    farm = models.Farm(**farm_data.model_dump())
-    db.add(farm)
-    db.commit()
-    db.refresh(farm)
+    await db.commit()
 
     # Publish event
     if event_publisher:
@@ -318,25 +395,39 @@ async def create_farm(
 @app.get("/api/v1/farms", response_model=List[FarmResponse])
 async def list_farms(
     is_active: bool = True,
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIST_LIMIT),
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List all farms"""
-    query = db.query(models.Farm).filter_by(is_active=is_active)
-    farms = query.offset(skip).limit(limit).all()
-    return [FarmResponse.model_validate(farm) for farm in farms]
+    stmt = select(*FARM_COLUMNS).filter_by(is_active=is_active)
+    rows = (await db.execute(stmt.offset(skip).limit(limit))).mappings().all()
+    return Response(
+        content=FARM_LIST_ADAPTER.dump_json([FarmResponse.model_construct(**row) for row in rows]),
+        media_type="application/json"
+    )
+
+
+@app.get("/api/v1/farms/count", response_model=CountResponse)
+async def count_farms(
+    is_active: bool = True,
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Count farms"""
+    stmt = select(models.Farm).filter_by(is_active=is_active)
+    return CountResponse(count=await db.scalar(stmt.with_only_columns(func.count())))
 
 
 @app.get("/api/v1/farms/{farm_id}", response_model=FarmResponse)
 async def get_farm(
     farm_id: UUID,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get farm by ID"""
-    farm = db.query(models.Farm).filter_by(id=farm_id).first()
+    farm = await db.get(models.Farm, farm_id)
     if not farm:
         raise HTTPException(status_code=404, detail="Farm not found")
     return FarmResponse.model_validate(farm)
@@ -347,20 +438,19 @@ async def update_farm(
     farm_id: UUID,
     farm_data: FarmUpdate,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a farm"""
-    farm = db.query(models.Farm).filter_by(id=farm_id).first()
-    if not farm:
+    # Patch only the fields the client sent, in one statement
+    farm = await db.scalar(
+        update(models.Farm)
+        .where(models.Farm.id == farm_id)
+        .values(**{field: getattr(farm_data, field) for field in farm_data.model_fields_set})
+        .returning(models.Farm)
+    )
+    if farm is None:
         raise HTTPException(status_code=404, detail="Farm not found")
-
-    # Update fields
-    update_data = farm_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(farm, field, value)
-
-    db.commit()
-    db.refresh(farm)
+    await db.commit()
 
     logger.info("Farm updated", farm_id=str(farm.id))
     return FarmResponse.model_validate(farm)
@@ -370,17 +460,20 @@ async def update_farm(
 async def delete_farm(
     farm_id: UUID,
     current_user=Depends(require_roles([Roles.ADMIN])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a farm (soft delete)"""
-    farm = db.query(models.Farm).filter_by(id=farm_id).first()
-    if not farm:
+    deleted = await db.scalar(
+        update(models.Farm)
+        .where(models.Farm.id == farm_id)
+        .values(is_active=False)
+        .returning(models.Farm.id)
+    )
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Farm not found")
+    await db.commit()
 
-    farm.is_active = False
-    db.commit()
-
-    logger.info("Farm deleted", farm_id=str(farm.id))
+    logger.info("Farm deleted", farm_id=str(farm_id))
     return None
 
 
@@ -392,26 +485,22 @@ async def delete_farm(
 async def create_plot(
     plot_data: PlotCreate,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE, Roles.AGENT_TERRAIN])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new plot"""
-    # Verify farm exists
-    farm = db.query(models.Farm).filter_by(id=plot_data.farm_id).first()
-    if not farm:
-        raise HTTPException(status_code=404, detail="Farm not found")
-
-    # Check if code exists for this farm
-    existing = db.query(models.Plot).filter_by(
-        farm_id=plot_data.farm_id,
-        code=plot_data.code
-    ).first()
-    if existing:
+    # Unknown references fail their foreign key; a duplicate code for the farm returns no row
+    try:
+        plot = await db.scalar(
+            pg_insert(models.Plot)
+            .values(**plot_data.model_dump())
+            .on_conflict_do_nothing(index_elements=['farm_id', 'code'])
+            .returning(models.Plot)
+        )
+    except IntegrityError as e:
+        raise foreign_key_not_found(e)
+    if plot is None:
         raise HTTPException(status_code=400, detail="Plot code already exists for this farm")
-
-    plot = models.Plot(**plot_data.model_dump())
-    db.add(plot)
-    db.commit()
-    db.refresh(plot)
+    await db.commit()
 
     # Publish event
     if event_publisher:
@@ -426,7 +515,7 @@ async def create_plot(
             }
         )
 
-    logger.info("Plot created", plot_id=str(plot.id), farm_id=str(farm.id))
+    logger.info("Plot created", plot_id=str(plot.id), farm_id=str(plot.farm_id))
     return PlotResponse.model_validate(plot)
 
 
@@ -435,31 +524,81 @@ async def list_plots(
     farm_id: Optional[UUID] = None,
     crop_type_id: Optional[UUID] = None,
     is_active: bool = True,
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIST_LIMIT),
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List plots"""
-    query = db.query(models.Plot).filter_by(is_active=is_active)
+    stmt = select(*PLOT_COLUMNS).filter_by(is_active=is_active)
 
     if farm_id:
-        query = query.filter_by(farm_id=farm_id)
+        stmt = stmt.filter_by(farm_id=farm_id)
     if crop_type_id:
-        query = query.filter_by(crop_type_id=crop_type_id)
+        stmt = stmt.filter_by(crop_type_id=crop_type_id)
 
-    plots = query.offset(skip).limit(limit).all()
-    return [PlotResponse.model_validate(plot) for plot in plots]
+    rows = (await db.execute(stmt.offset(skip).limit(limit))).mappings().all()
+    return Response(
+        content=PLOT_LIST_ADAPTER.dump_json([PlotResponse.model_construct(**row) for row in rows]),
+        media_type="application/json"
+    )
+
+
+@app.get("/api/v1/plots/count", response_model=CountResponse)
+async def count_plots(
+    farm_id: Optional[UUID] = None,
+    crop_type_id: Optional[UUID] = None,
+    is_active: bool = True,
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Count plots"""
+    stmt = select(models.Plot).filter_by(is_active=is_active)
+
+    if farm_id:
+        stmt = stmt.filter_by(farm_id=farm_id)
+    if crop_type_id:
+        stmt = stmt.filter_by(crop_type_id=crop_type_id)
+
+    return CountResponse(count=await db.scalar(stmt.with_only_columns(func.count())))
+
+
+@app.get("/api/v1/plots/export")
+async def export_plots(
+    farm_id: Optional[UUID] = None,
+    crop_type_id: Optional[UUID] = None,
+    is_active: bool = True,
+    current_user=Depends(get_current_user)
+):
+    """Export plots as newline-delimited JSON"""
+    stmt = select(*PLOT_COLUMNS).filter_by(is_active=is_active)
+
+    if farm_id:
+        stmt = stmt.filter_by(farm_id=farm_id)
+    if crop_type_id:
+        stmt = stmt.filter_by(crop_type_id=crop_type_id)
+
+    async def stream() -> AsyncIterator[bytes]:
+        # Own session: request dependencies are torn down before the body is sent
+        async with get_async_db_session(AsyncSessionFactory) as db:
+            result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for rows in result.mappings().partitions():
+                yield b"".join(
+                    PLOT_ADAPTER.dump_json(PlotResponse.model_construct(**row)) + b"\n"
+                    for row in rows
+                )
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 
 @app.get("/api/v1/plots/{plot_id}", response_model=PlotResponse)
 async def get_plot(
     plot_id: UUID,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get plot by ID"""
-    plot = db.query(models.Plot).filter_by(id=plot_id).first()
+    plot = await db.get(models.Plot, plot_id)
     if not plot:
         raise HTTPException(status_code=404, detail="Plot not found")
     return PlotResponse.model_validate(plot)
@@ -470,20 +609,22 @@ async def update_plot(
     plot_id: UUID,
     plot_data: PlotUpdate,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE, Roles.AGENT_TERRAIN])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a plot"""
-    plot = db.query(models.Plot).filter_by(id=plot_id).first()
-    if not plot:
+    # Patch only the fields the client sent, in one statement
+    try:
+        plot = await db.scalar(
+            update(models.Plot)
+            .where(models.Plot.id == plot_id)
+            .values(**{field: getattr(plot_data, field) for field in plot_data.model_fields_set})
+            .returning(models.Plot)
+        )
+    except IntegrityError as e:
+        raise foreign_key_not_found(e)
+    if plot is None:
         raise HTTPException(status_code=404, detail="Plot not found")
-
-    # Update fields
-    update_data = plot_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(plot, field, value)
-
-    db.commit()
-    db.refresh(plot)
+    await db.commit()
 
     logger.info("Plot updated", plot_id=str(plot.id))
     return PlotResponse.model_validate(plot)
@@ -493,17 +634,20 @@ async def update_plot(
 async def delete_plot(
     plot_id: UUID,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a plot (soft delete)"""
-    plot = db.query(models.Plot).filter_by(id=plot_id).first()
-    if not plot:
+    deleted = await db.scalar(
+        update(models.Plot)
+        .where(models.Plot.id == plot_id)
+        .values(is_active=False)
+        .returning(models.Plot.id)
+    )
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Plot not found")
+    await db.commit()
 
-    plot.is_active = False
-    db.commit()
-
-    logger.info("Plot deleted", plot_id=str(plot.id))
+    logger.info("Plot deleted", plot_id=str(plot_id))
     return None
 
 
@@ -515,26 +659,22 @@ async def delete_plot(
 async def create_season(
     season_data: SeasonCreate,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new season/campaign"""
-    # Verify farm exists
-    farm = db.query(models.Farm).filter_by(id=season_data.farm_id).first()
-    if not farm:
-        raise HTTPException(status_code=404, detail="Farm not found")
-
-    # Check if code exists for this farm
-    existing = db.query(models.Season).filter_by(
-        farm_id=season_data.farm_id,
-        code=season_data.code
-    ).first()
-    if existing:
+    # Unknown references fail their foreign key; a duplicate code for the farm returns no row
+    try:
+        season = await db.scalar(
+            pg_insert(models.Season)
+            .values(**season_data.model_dump())
+            .on_conflict_do_nothing(index_elements=['farm_id', 'code'])
+            .returning(models.Season)
+        )
+    except IntegrityError as e:
+        raise foreign_key_not_found(e)
+    if season is None:
         raise HTTPException(status_code=400, detail="Season code already exists for this farm")
-
-    season = models.Season(**season_data.model_dump())
-    db.add(season)
-    db.commit()
-    db.refresh(season)
+    await db.commit()
 
     # Publish event
     if event_publisher:
@@ -549,7 +689,7 @@ async def create_season(
             }
         )
 
-    logger.info("Season created", season_id=str(season.id), farm_id=str(farm.id))
+    logger.info("Season created", season_id=str(season.id), farm_id=str(season.farm_id))
     return SeasonResponse.model_validate(season)
 
 
@@ -559,33 +699,36 @@ async def list_seasons(
     year: Optional[int] = None,
     status: Optional[str] = None,
     is_active: bool = True,
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIST_LIMIT),
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List seasons"""
-    query = db.query(models.Season).filter_by(is_active=is_active)
+    stmt = select(*SEASON_COLUMNS).filter_by(is_active=is_active)
 
     if farm_id:
-        query = query.filter_by(farm_id=farm_id)
+        stmt = stmt.filter_by(farm_id=farm_id)
     if year:
-        query = query.filter_by(year=year)
+        stmt = stmt.filter_by(year=year)
     if status:
-        query = query.filter_by(status=status)
+        stmt = stmt.filter_by(status=status)
 
-    seasons = query.offset(skip).limit(limit).all()
-    return [SeasonResponse.model_validate(season) for season in seasons]
+    rows = (await db.execute(stmt.offset(skip).limit(limit))).mappings().all()
+    return Response(
+        content=SEASON_LIST_ADAPTER.dump_json([SeasonResponse.model_construct(**row) for row in rows]),
+        media_type="application/json"
+    )
 
 
 @app.get("/api/v1/seasons/{season_id}", response_model=SeasonResponse)
 async def get_season(
     season_id: UUID,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get season by ID"""
-    season = db.query(models.Season).filter_by(id=season_id).first()
+    season = await db.get(models.Season, season_id)
     if not season:
         raise HTTPException(status_code=404, detail="Season not found")
     return SeasonResponse.model_validate(season)
@@ -596,20 +739,19 @@ async def update_season(
     season_id: UUID,
     season_data: SeasonUpdate,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a season"""
-    season = db.query(models.Season).filter_by(id=season_id).first()
-    if not season:
+    # Patch only the fields the client sent, in one statement
+    season = await db.scalar(
+        update(models.Season)
+        .where(models.Season.id == season_id)
+        .values(**{field: getattr(season_data, field) for field in season_data.model_fields_set})
+        .returning(models.Season)
+    )
+    if season is None:
         raise HTTPException(status_code=404, detail="Season not found")
-
-    # Update fields
-    update_data = season_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(season, field, value)
-
-    db.commit()
-    db.refresh(season)
+    await db.commit()
 
     logger.info("Season updated", season_id=str(season.id))
     return SeasonResponse.model_validate(season)
@@ -619,17 +761,20 @@ async def update_season(
 async def delete_season(
     season_id: UUID,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a season (soft delete)"""
-    season = db.query(models.Season).filter_by(id=season_id).first()
-    if not season:
+    deleted = await db.scalar(
+        update(models.Season)
+        .where(models.Season.id == season_id)
+        .values(is_active=False)
+        .returning(models.Season.id)
+    )
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Season not found")
+    await db.commit()
 
-    season.is_active = False
-    db.commit()
-
-    logger.info("Season deleted", season_id=str(season.id))
+    logger.info("Season deleted", season_id=str(season_id))
     return None
 
 
@@ -641,17 +786,19 @@ async def delete_season(
 async def create_crop_type(
     crop_data: CropTypeCreate,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new crop type"""
-    # Check if code already exists
-    if db.query(models.CropType).filter_by(code=crop_data.code).first():
+    # The unique code index rejects duplicates; no RETURNING row means the code exists
+    crop_type = await db.scalar(
+        pg_insert(models.CropType)
+        .values(**crop_data.model_dump())
+        .on_conflict_do_nothing(index_elements=['code'])
+        .returning(models.CropType)
+    )
+    if crop_type is None:
         raise HTTPException(status_code=400, detail="Crop type code already exists")
-
-    crop_type = models.CropType(**crop_data.model_dump())
-    db.add(crop_type)
-    db.commit()
-    db.refresh(crop_type)
+    await db.commit()
 
     logger.info("Crop type created", crop_type_id=str(crop_type.id), code=crop_type.code)
     return CropTypeResponse.model_validate(crop_type)
@@ -661,29 +808,32 @@ async def create_crop_type(
 async def list_crop_types(
     category: Optional[str] = None,
     is_active: bool = True,
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIST_LIMIT),
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List crop types"""
-    query = db.query(models.CropType).filter_by(is_active=is_active)
+    stmt = select(*CROP_TYPE_COLUMNS).filter_by(is_active=is_active)
 
     if category:
-        query = query.filter_by(category=category)
+        stmt = stmt.filter_by(category=category)
 
-    crop_types = query.offset(skip).limit(limit).all()
-    return [CropTypeResponse.model_validate(ct) for ct in crop_types]
+    rows = (await db.execute(stmt.offset(skip).limit(limit))).mappings().all()
+    return Response(
+        content=CROP_TYPE_LIST_ADAPTER.dump_json([CropTypeResponse.model_construct(**row) for row in rows]),
+        media_type="application/json"
+    )
 
 
 @app.get("/api/v1/crop-types/{crop_type_id}", response_model=CropTypeResponse)
 async def get_crop_type(
     crop_type_id: UUID,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get crop type by ID"""
-    crop_type = db.query(models.CropType).filter_by(id=crop_type_id).first()
+    crop_type = await db.get(models.CropType, crop_type_id)
     if not crop_type:
         raise HTTPException(status_code=404, detail="Crop type not found")
     return CropTypeResponse.model_validate(crop_type)
@@ -694,20 +844,19 @@ async def update_crop_type(
     crop_type_id: UUID,
     crop_data: CropTypeUpdate,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a crop type"""
-    crop_type = db.query(models.CropType).filter_by(id=crop_type_id).first()
-    if not crop_type:
+    # Patch only the fields the client sent, in one statement
+    crop_type = await db.scalar(
+        update(models.CropType)
+        .where(models.CropType.id == crop_type_id)
+        .values(**{field: getattr(crop_data, field) for field in crop_data.model_fields_set})
+        .returning(models.CropType)
+    )
+    if crop_type is None:
         raise HTTPException(status_code=404, detail="Crop type not found")
-
-    # Update fields
-    update_data = crop_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(crop_type, field, value)
-
-    db.commit()
-    db.refresh(crop_type)
+    await db.commit()
 
     logger.info("Crop type updated", crop_type_id=str(crop_type.id))
     return CropTypeResponse.model_validate(crop_type)
@@ -717,17 +866,20 @@ async def update_crop_type(
 async def delete_crop_type(
     crop_type_id: UUID,
     current_user=Depends(require_roles([Roles.ADMIN])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a crop type (soft delete)"""
-    crop_type = db.query(models.CropType).filter_by(id=crop_type_id).first()
-    if not crop_type:
+    deleted = await db.scalar(
+        update(models.CropType)
+        .where(models.CropType.id == crop_type_id)
+        .values(is_active=False)
+        .returning(models.CropType.id)
+    )
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Crop type not found")
+    await db.commit()
 
-    crop_type.is_active = False
-    db.commit()
-
-    logger.info("Crop type deleted", crop_type_id=str(crop_type.id))
+    logger.info("Crop type deleted", crop_type_id=str(crop_type_id))
     return None
 
 
@@ -735,10 +887,26 @@ async def delete_crop_type(
 # Health Check
 # ============================================
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "service": "farm-service"}
+HEALTH_RESPONSE_BODY = ORJSONResponse({"status": "healthy", "service": "farm-service"}).body
+
+
+class HealthCheckApp:
+    """Bare ASGI health check endpoint, bypassing FastAPI request handling"""
+
+    async def __call__(self, scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(HEALTH_RESPONSE_BODY)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": HEALTH_RESPONSE_BODY})
+
+
+# Matched first so probes never walk the API route table
+app.router.routes.insert(0, Route("/health", HealthCheckApp(), methods=["GET"]))
 
 
 if __name__ == "__main__":
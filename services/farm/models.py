@@ -2,7 +2,7 @@
 Farm Service Database Models
 Farms, Plots (parcelles), Seasons/Campaigns, Crop Types
 """
-from sqlalchemy import Column, String, Numeric, ForeignKey, Boolean, Integer
+from sqlalchemy import Column, String, Numeric, ForeignKey, Boolean, Integer, Date, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -23,15 +23,15 @@ class Farm(Base, TimestampMixin):
     code = Column(String(50), unique=True, nullable=False, index=True)
     description = Column(String(500))
     location = Column(String(255))  # Physical address or GPS coordinates
-    total_area = Column(Numeric(12, 2))  # Total area in hectares
+    total_area = Column(Numeric(12, 2, asdecimal=False))  # Total area in hectares
     owner_name = Column(String(255))
     contact_phone = Column(String(20))
     contact_email = Column(String(255))
     is_active = Column(Boolean, default=True, nullable=False)
 
     # Relationships
-    plots = relationship('Plot', back_populates='farm', cascade='all, delete-orphan')
-    seasons = relationship('Season', back_populates='farm', cascade='all, delete-orphan')
+    plots = relationship('Plot', back_populates='farm', cascade='all, delete-orphan', lazy='raise')
+    seasons = relationship('Season', back_populates='farm', cascade='all, delete-orphan', lazy='raise')
 
 
 class CropType(Base, TimestampMixin):
@@ -43,25 +43,30 @@ class CropType(Base, TimestampMixin):
     name = Column(String(255), nullable=False, index=True)
     description = Column(String(500))
     category = Column(String(100))  # e.g., "cereals", "vegetables", "fruits", "cash_crops"
-    typical_yield_per_ha = Column(Numeric(12, 2))  # Average yield in kg/ha or tons/ha
+    typical_yield_per_ha = Column(Numeric(12, 2, asdecimal=False))  # Average yield in kg/ha or tons/ha
     typical_cycle_days = Column(Integer)  # Typical growing cycle in days
     unit = Column(String(20), nullable=False, default="kg")  # kg, tons, units
     is_active = Column(Boolean, default=True, nullable=False)
 
     # Relationships
-    plots = relationship('Plot', back_populates='crop_type')
+    plots = relationship('Plot', back_populates='crop_type', lazy='raise')
 
 
 class Plot(Base, TimestampMixin):
     """Plot/Parcelle - a subdivision of a farm for specific crops"""
     __tablename__ = 'plots'
 
+    __table_args__ = (
+        UniqueConstraint('farm_id', 'code', name='uq_plot_farm_code'),
+        Index('idx_plot_farm_active_crop', 'farm_id', 'is_active', 'crop_type_id'),
+    )
+
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     farm_id = Column(UUID(as_uuid=True), ForeignKey('farms.id', ondelete='CASCADE'), nullable=False, index=True)
     code = Column(String(50), nullable=False, index=True)  # Unique within farm
     name = Column(String(255), nullable=False)
     description = Column(String(500))
-    area = Column(Numeric(12, 2), nullable=False)  # Area in hectares
+    area = Column(Numeric(12, 2, asdecimal=False), nullable=False)  # Area in hectares
     soil_type = Column(String(100))  # e.g., "clay", "sandy", "loam"
     irrigation_available = Column(Boolean, default=False)
 
@@ -72,15 +77,21 @@ class Plot(Base, TimestampMixin):
     is_active = Column(Boolean, default=True, nullable=False)
 
     # Relationships
-    farm = relationship('Farm', back_populates='plots')
-    crop_type = relationship('CropType', back_populates='plots')
-    current_season = relationship('Season', foreign_keys=[current_season_id])
+    farm = relationship('Farm', back_populates='plots', lazy='raise')
+    crop_type = relationship('CropType', back_populates='plots', lazy='raise')
+    current_season = relationship('Season', foreign_keys=[current_season_id], lazy='raise')
 
 
 class Season(Base, TimestampMixin):
     """Season/Campaign (Campagne/Saison) - a growing cycle"""
     __tablename__ = 'seasons'
 
+    __table_args__ = (
+        UniqueConstraint('farm_id', 'code', name='uq_season_farm_code'),
+        Index('idx_season_farm_start', 'farm_id', 'start_date'),
+        Index('idx_season_farm_active_year_status', 'farm_id', 'is_active', 'year', 'status'),
+    )
+
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     farm_id = Column(UUID(as_uuid=True), ForeignKey('farms.id', ondelete='CASCADE'), nullable=False, index=True)
     name = Column(String(255), nullable=False)  # e.g., "Saison 2025-A", "Campagne Maïs 2025"
@@ -88,10 +99,10 @@ class Season(Base, TimestampMixin):
     description = Column(String(500))
     year = Column(Integer, nullable=False, index=True)
     season_number = Column(Integer)  # 1, 2, 3 for multiple seasons per year
-    start_date = Column(String(50))  # ISO date string YYYY-MM-DD
-    end_date = Column(String(50))  # ISO date string YYYY-MM-DD
+    start_date = Column(Date)
+    end_date = Column(Date)
     status = Column(String(50), default="planned", nullable=False)  # planned, active, completed, cancelled
     is_active = Column(Boolean, default=True, nullable=False)
 
     # Relationships
-    farm = relationship('Farm', back_populates='seasons')
+    farm = relationship('Farm', back_populates='seasons', lazy='raise')
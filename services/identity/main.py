@@ -2,16 +2,29 @@
 Identity & Access Service
 FastAPI application for authentication and authorization
 """
-from fastapi import FastAPI, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import FastAPI, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timedelta
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import UUID
+import asyncio
 import os
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from shared.database import create_db_engine, get_session_factory, get_db_session, Base
+from shared.database import (
+    create_async_db_engine,
+    get_async_session_factory,
+    get_async_db_session,
+    Base
+)
 from shared.auth import (
     get_password_hash,
     verify_password,
@@ -22,126 +35,178 @@ from shared.auth import (
     Roles
 )
 from shared.logging_config import configure_logging
-from shared.events import EventPublisher
+from shared.events import EventPublisher, QueuedEventPublisher
 
 import models
 import schemas
+from pydantic import TypeAdapter
 
 # Initialize logging
 logger = configure_logging("identity-service")
 
 # Database setup
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_db_engine(DATABASE_URL)
-SessionFactory = get_session_factory(engine)
+async_engine = create_async_db_engine(DATABASE_URL)
+AsyncSessionFactory = get_async_session_factory(async_engine)
 
-# Create tables (dev only; prefer migrations in prod)
-if os.getenv("AUTO_CREATE_DB", "true").lower() == "true":
-    Base.metadata.create_all(bind=engine)
+# Refresh token housekeeping: revoked tokens are deleted outright, long-expired ones purged periodically
+REFRESH_TOKEN_RETENTION_DAYS = int(os.getenv("REFRESH_TOKEN_RETENTION_DAYS", "30"))
+REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS = float(os.getenv("REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS", "3600"))
 
-# Event publisher
+# Event publisher (queued; a background task publishes off the request path)
 RABBITMQ_URL = os.getenv("RABBITMQ_URL")
-event_publisher = EventPublisher(RABBITMQ_URL, "identity-service") if RABBITMQ_URL else None
+event_publisher = (
+    QueuedEventPublisher(EventPublisher(RABBITMQ_URL, "identity-service")) if RABBITMQ_URL else None
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize service on startup and cleanup on shutdown"""
+    logger.info("Identity service starting up")
+    # Create tables (dev only; prefer migrations in prod)
+    if os.getenv("AUTO_CREATE_DB", "true").lower() == "true":
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    if event_publisher:
+        await event_publisher.start()
+
+    # Create default roles and admin user if not exists
+    async with get_async_db_session(AsyncSessionFactory) as db:
+        await create_default_data(db)
+
+    app.state.refresh_token_cleanup_task = asyncio.create_task(refresh_token_cleanup_loop())
+
+    yield
+
+    logger.info("Identity service shutting down")
+    app.state.refresh_token_cleanup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.refresh_token_cleanup_task
+    if event_publisher:
+        await event_publisher.close()
+    await async_engine.dispose()
+
 
 # FastAPI app
 app = FastAPI(
     title="Identity & Access Service",
     description="Authentication and authorization microservice",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
 # Dependency to get database session
-def get_db():
-    with get_db_session(SessionFactory) as session:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_db_session(AsyncSessionFactory) as session:
         yield session
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize service on startup"""
-    logger.info("Identity service starting up")
-    if event_publisher:
-        event_publisher.connect()
+# Serializers built once; list handlers dump a whole page per call
+USER_LIST_ADAPTER = TypeAdapter(List[schemas.UserResponse])
+ROLE_LIST_ADAPTER = TypeAdapter(List[schemas.RoleResponse])
+PERMISSION_LIST_ADAPTER = TypeAdapter(List[schemas.PermissionResponse])
 
-    # Create default roles and admin user if not exists
-    with get_db_session(SessionFactory) as db:
-        create_default_data(db)
+# Responses are built from trusted DB rows with model_construct (no re-validation)
+PERMISSION_FIELDS = list(schemas.PermissionResponse.model_fields)
+ROLE_FIELDS = [name for name in schemas.RoleResponse.model_fields if name != "permissions"]
+USER_FIELDS = [name for name in schemas.UserResponse.model_fields if name != "roles"]
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("Identity service shutting down")
-    if event_publisher:
-        event_publisher.close()
+def permission_response(permission: models.Permission) -> schemas.PermissionResponse:
+    """PermissionResponse from a loaded permission"""
+    return schemas.PermissionResponse.model_construct(
+        **{name: getattr(permission, name) for name in PERMISSION_FIELDS}
+    )
+
+
+def role_response(role: models.Role) -> schemas.RoleResponse:
+    """RoleResponse from a role with its permissions loaded"""
+    return schemas.RoleResponse.model_construct(
+        **{name: getattr(role, name) for name in ROLE_FIELDS},
+        permissions=[permission_response(permission) for permission in role.permissions]
+    )
+
 
+def user_response(user: models.User) -> schemas.UserResponse:
+    """UserResponse from a user with roles and permissions loaded"""
+    return schemas.UserResponse.model_construct(
+        **{name: getattr(user, name) for name in USER_FIELDS},
+        roles=[role_response(role) for role in user.roles]
+    )
+
+
+# ============================================
+# Default Data
+# ============================================
 
-def create_default_data(db: Session):
+DEFAULT_PERMISSIONS = [
+    {"name": "farm:read", "resource": "farm", "action": "read", "description": "Read farm data"},
+    {"name": "farm:write", "resource": "farm", "action": "write", "description": "Create/update farm data"},
+    {"name": "inventory:read", "resource": "inventory", "action": "read", "description": "Read inventory"},
+    {"name": "inventory:write", "resource": "inventory", "action": "write", "description": "Manage inventory"},
+    {"name": "sales:read", "resource": "sales", "action": "read", "description": "Read sales"},
+    {"name": "sales:write", "resource": "sales", "action": "write", "description": "Create sales"},
+    {"name": "accounting:read", "resource": "accounting", "action": "read", "description": "Read accounting"},
+    {"name": "accounting:write", "resource": "accounting", "action": "write", "description": "Manage accounting"},
+    {"name": "users:manage", "resource": "users", "action": "manage", "description": "Manage users"},
+]
+
+# Permission names granted to each system role
+ALL_PERMISSIONS = frozenset(perm_data["name"] for perm_data in DEFAULT_PERMISSIONS)
+ROLE_PERMISSIONS = {
+    Roles.ADMIN: ALL_PERMISSIONS,
+    Roles.GESTIONNAIRE: ALL_PERMISSIONS - {"users:manage"},
+    Roles.AGENT_TERRAIN: frozenset({"farm:read", "farm:write", "inventory:read"}),
+    Roles.COMPTABLE: frozenset({"accounting:read", "accounting:write", "sales:read"}),
+}
+
+
+async def create_default_data(db: AsyncSession):
     """Create default roles and admin user"""
     admin_username = os.getenv("ADMIN_USERNAME", "admin")
     admin_password = os.getenv("ADMIN_PASSWORD")
     admin_email = os.getenv("ADMIN_EMAIL", "admin@agricole.com")
     admin_full_name = os.getenv("ADMIN_FULL_NAME", "Administrateur Systeme")
 
-    # Create default permissions
-    default_permissions = [
-        {"name": "farm:read", "resource": "farm", "action": "read", "description": "Read farm data"},
-        {"name": "farm:write", "resource": "farm", "action": "write", "description": "Create/update farm data"},
-        {"name": "inventory:read", "resource": "inventory", "action": "read", "description": "Read inventory"},
-        {"name": "inventory:write", "resource": "inventory", "action": "write", "description": "Manage inventory"},
-        {"name": "sales:read", "resource": "sales", "action": "read", "description": "Read sales"},
-        {"name": "sales:write", "resource": "sales", "action": "write", "description": "Create sales"},
-        {"name": "accounting:read", "resource": "accounting", "action": "read", "description": "Read accounting"},
-        {"name": "accounting:write", "resource": "accounting", "action": "write", "description": "Manage accounting"},
-        {"name": "users:manage", "resource": "users", "action": "manage", "description": "Manage users"},
-    ]
-
-    permissions = {}
-    for perm_data in default_permissions:
-        perm = db.query(models.Permission).filter_by(name=perm_data["name"]).first()
-        if not perm:
-            perm = models.Permission(**perm_data)
-            db.add(perm)
-            db.flush()
-        permissions[perm_data["name"]] = perm
+    # One upsert for all permissions, one SELECT to load them back
+    await db.execute(
+        pg_insert(models.Permission).values(DEFAULT_PERMISSIONS).on_conflict_do_nothing(index_elements=['name'])
+    )
+    permission_names = [perm_data["name"] for perm_data in DEFAULT_PERMISSIONS]
+    permissions = {
+        perm.name: perm
+        for perm in await db.scalars(
+            select(models.Permission).where(models.Permission.name.in_(permission_names))
+        )
+    }
 
     # Create default roles
     roles_config = {
-        Roles.ADMIN: {
-            "description": "Administrateur système - accès complet",
-            "permissions": list(permissions.values())
-        },
-        Roles.GESTIONNAIRE: {
-            "description": "Gestionnaire - gestion opérationnelle",
-            "permissions": [p for name, p in permissions.items() if "manage" not in name or "users" not in name]
-        },
-        Roles.AGENT_TERRAIN: {
-            "description": "Agent terrain - saisie données terrain",
-            "permissions": [p for name, p in permissions.items() if "farm" in name or "inventory:read" in name]
-        },
-        Roles.COMPTABLE: {
-            "description": "Comptable - gestion comptabilité et TVA",
-            "permissions": [p for name, p in permissions.items() if "accounting" in name or "sales:read" in name]
-        }
+        Roles.ADMIN: {"description": "Administrateur système - accès complet"},
+        Roles.GESTIONNAIRE: {"description": "Gestionnaire - gestion opérationnelle"},
+        Roles.AGENT_TERRAIN: {"description": "Agent terrain - saisie données terrain"},
+        Roles.COMPTABLE: {"description": "Comptable - gestion comptabilité et TVA"},
     }
 
-    roles = {}
-    for role_name, role_config in roles_config.items():
-        role = db.query(models.Role).filter_by(name=role_name).first()
-        if not role:
-            role = models.Role(
-                name=role_name,
-                description=role_config["description"],
-                is_system_role=True
-            )
-            db.add(role)
-            db.flush()
-        role.permissions = role_config["permissions"]
-        roles[role_name] = role
+    await db.execute(
+        pg_insert(models.Role).values([
+            {"name": role_name, "description": role_config["description"], "is_system_role": True}
+            for role_name, role_config in roles_config.items()
+        ]).on_conflict_do_nothing(index_elements=['name'])
+    )
+    roles = {
+        role.name: role
+        for role in await db.scalars(select(models.Role).where(models.Role.name.in_(list(roles_config))))
+    }
+    for role_name, permission_names in ROLE_PERMISSIONS.items():
+        roles[role_name].permissions = [permissions[name] for name in sorted(permission_names)]
 
     # Create default admin user
-    admin = db.query(models.User).filter_by(username=admin_username).first()
+    admin = await db.scalar(select(models.User).filter_by(username=admin_username))
     if not admin:
         if not admin_password:
             logger.warning("ADMIN_PASSWORD not set; skipping default admin user creation.")
@@ -149,7 +214,7 @@ def create_default_data(db: Session):
             admin = models.User(
                 username=admin_username,
                 email=admin_email,
-                hashed_password=get_password_hash(admin_password),
+                hashed_password=await asyncio.to_thread(get_password_hash, admin_password),
                 full_name=admin_full_name,
                 is_active=True,
                 is_superuser=True
@@ -162,7 +227,56 @@ def create_default_data(db: Session):
             admin.email = admin_email
 
 
-    db.commit()
+    await db.commit()
+
+
+# ============================================
+# Refresh Token Cleanup
+# ============================================
+
+async def purge_refresh_tokens() -> int:
+    """Delete refresh tokens expired past the retention window"""
+    async with get_async_db_session(AsyncSessionFactory) as db:
+        result = await db.execute(
+            delete(models.RefreshToken).where(
+                models.RefreshToken.expires_at < func.now() - timedelta(days=REFRESH_TOKEN_RETENTION_DAYS)
+            )
+        )
+    return result.rowcount
+
+
+async def refresh_token_cleanup_loop():
+    """Purge refresh tokens every REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS"""
+    while True:
+        # Sleep first so startup and shutdown rarely land mid-DELETE
+        await asyncio.sleep(REFRESH_TOKEN_CLEANUP_INTERVAL_SECONDS)
+        try:
+            deleted = await purge_refresh_tokens()
+            if deleted:
+                logger.info("Refresh tokens purged", count=deleted)
+        except Exception as e:
+            logger.error("Refresh token cleanup failed", error=str(e))
+
+
+# ============================================
+# RBAC Loading
+# ============================================
+
+# User -> roles -> permissions in the same round trip as the user row
+USER_RBAC_OPTIONS = joinedload(models.User.roles).joinedload(models.Role.permissions)
+
+
+async def load_user_with_rbac(db: AsyncSession, *criteria) -> Optional[models.User]:
+    """Load one user with roles and permissions in a single query"""
+    result = await db.execute(select(models.User).where(*criteria).options(USER_RBAC_OPTIONS))
+    return result.unique().scalar_one_or_none()
+
+
+def rbac_claims(user: models.User) -> Tuple[List[str], List[str]]:
+    """Role names and deduplicated scopes for a user's tokens"""
+    role_names = [role.name for role in user.roles]
+    scopes = sorted({perm.name for role in user.roles for perm in role.permissions})
+    return role_names, scopes
 
 
 # ============================================
@@ -170,11 +284,12 @@ def create_default_data(db: Session):
 # ============================================
 
 @app.post("/api/v1/auth/login", response_model=schemas.LoginResponse)
-async def login(login_data: schemas.LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: schemas.LoginRequest, db: AsyncSession = Depends(get_db)):
     """Authenticate user and return JWT tokens"""
-    user = db.query(models.User).filter(models.User.username == login_data.username).first()
+    user = await load_user_with_rbac(db, models.User.username == login_data.username)
 
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    # bcrypt is CPU-bound; keep it off the event loop
+    if not user or not await asyncio.to_thread(verify_password, login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
@@ -187,8 +302,7 @@ async def login(login_data: schemas.LoginRequest, db: Session = Depends(get_db))
         )
 
     # Create tokens
-    role_names = [role.name for role in user.roles]
-    scopes = [perm.name for role in user.roles for perm in role.permissions]
+    role_names, scopes = rbac_claims(user)
 
     tokens = create_token_pair(
         user_id=str(user.id),
@@ -208,44 +322,47 @@ async def login(login_data: schemas.LoginRequest, db: Session = Depends(get_db))
 
     # Update last login
     user.last_login_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
 
     # Publish event
     if event_publisher:
-        try:
-            event_publisher.publish_event(
-                "user.logged_in",
-                {"user_id": str(user.id), "username": user.username}
-            )
-        except Exception as exc:
-            logger.warning("Event publish failed", error=str(exc), event="user.logged_in")
+        event_publisher.publish_event(
+            "user.logged_in",
+            {"user_id": str(user.id), "username": user.username}
+        )
 
     logger.info("User logged in", user_id=str(user.id), username=user.username)
 
     return schemas.LoginResponse(
         access_token=tokens.access_token,
         refresh_token=tokens.refresh_token,
-        user=schemas.UserResponse.model_validate(user)
+        user=user_response(user)
     )
 
 
 @app.post("/api/v1/auth/refresh", response_model=schemas.TokenResponse)
-async def refresh_token(request: schemas.RefreshTokenRequest, db: Session = Depends(get_db)):
+async def refresh_token(request: schemas.RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
     """Refresh access token using refresh token"""
-    token_record = db.query(models.RefreshToken).filter_by(
-        token=request.refresh_token,
-        is_revoked=False
-    ).first()
+    # Revoke by deleting: the old token is consumed atomically, so a replayed
+    # token cannot be rotated twice and no revoked rows are left behind
+    result = await db.execute(
+        delete(models.RefreshToken)
+        .where(
+            models.RefreshToken.token == request.refresh_token,
+            models.RefreshToken.expires_at > func.now()
+        )
+        .returning(models.RefreshToken.user_id, models.RefreshToken.device_info)
+    )
+    token_record = result.first()
+    user = token_record and await load_user_with_rbac(db, models.User.id == token_record.user_id)
 
-    if not token_record or token_record.expires_at < datetime.utcnow():
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token"
         )
 
-    user = token_record.user
-    role_names = [role.name for role in user.roles]
-    scopes = [perm.name for role in user.roles for perm in role.permissions]
+    role_names, scopes = rbac_claims(user)
 
     tokens = create_token_pair(
         user_id=str(user.id),
@@ -254,8 +371,6 @@ async def refresh_token(request: schemas.RefreshTokenRequest, db: Session = Depe
         scopes=scopes
     )
 
-    # Revoke old refresh token and create new one
-    token_record.is_revoked = True
     new_refresh_token = models.RefreshToken(
         token=tokens.refresh_token,
         user_id=user.id,
@@ -263,7 +378,7 @@ async def refresh_token(request: schemas.RefreshTokenRequest, db: Session = Depe
         device_info=token_record.device_info
     )
     db.add(new_refresh_token)
-    db.commit()
+    await db.commit()
 
     return schemas.TokenResponse(
         access_token=tokens.access_token,
@@ -275,13 +390,13 @@ async def refresh_token(request: schemas.RefreshTokenRequest, db: Session = Depe
 async def logout(
     request: schemas.RefreshTokenRequest,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Logout user and revoke refresh token"""
-    token_record = db.query(models.RefreshToken).filter_by(token=request.refresh_token).first()
-    if token_record:
-        token_record.is_revoked = True
-        db.commit()
+    await db.execute(
+        delete(models.RefreshToken).filter_by(token=request.refresh_token)
+    )
+    await db.commit()
 
     logger.info("User logged out", user_id=current_user.user_id)
     return {"message": "Logged out successfully"}
@@ -291,25 +406,34 @@ async def logout(
 # User Management Endpoints
 # ============================================
 
+# Unique indexes on users -> 400 detail for the clashing field
+USER_UNIQUE_DETAILS = {
+    "ix_users_username": "Username already registered",
+    "ix_users_email": "Email already registered",
+}
+
+
+def user_already_registered(error: IntegrityError) -> HTTPException:
+    """Map a unique violation on users to a 400 naming the taken field"""
+    message = str(error.orig)
+    for index_name, detail in USER_UNIQUE_DETAILS.items():
+        if f'"{index_name}"' in message:
+            return HTTPException(status_code=400, detail=detail)
+    raise error
+
+
 @app.post("/api/v1/users", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: schemas.UserCreate,
     current_user = Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new user"""
-    # Check if username or email already exists
-    if db.query(models.User).filter(models.User.username == user_data.username).first():
-        raise HTTPException(status_code=400, detail="Username already registered")
-
-    if db.query(models.User).filter(models.User.email == user_data.email).first():
-        raise HTTPException(status_code=400, detail="Email already registered")
-
-    # Create user
+    # Username/email uniqueness is enforced by the unique indexes at commit
     user = models.User(
         username=user_data.username,
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await asyncio.to_thread(get_password_hash, user_data.password),
         full_name=user_data.full_name,
         phone_number=user_data.phone_number,
         is_active=True,
@@ -318,37 +442,37 @@ async def create_user(
 
     # Assign roles
     if user_data.role_ids:
-        roles = db.query(models.Role).filter(models.Role.id.in_(user_data.role_ids)).all()
-        user.roles = roles
+        roles = (await db.scalars(select(models.Role).where(models.Role.id.in_(user_data.role_ids)))).all()
+        user.roles = list(roles)
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        raise user_already_registered(e)
+    await db.refresh(user)
 
     # Publish event
     if event_publisher:
-        try:
-            event_publisher.publish_event(
-                "user.created",
-                {"user_id": str(user.id), "username": user.username, "email": user.email}
-            )
-        except Exception as exc:
-            logger.warning("Event publish failed", error=str(exc), event="user.created")
+        event_publisher.publish_event(
+            "user.created",
+            {"user_id": str(user.id), "username": user.username, "email": user.email}
+        )
 
     logger.info("User created", user_id=str(user.id), username=user.username)
-    return schemas.UserResponse.model_validate(user)
+    return user_response(user)
 
 
 @app.get("/api/v1/users/me", response_model=schemas.UserResponse)
 async def get_current_user_info(
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get current user information"""
-    user = db.query(models.User).filter(models.User.id == current_user.user_id).first()
+    user = await load_user_with_rbac(db, models.User.id == current_user.user_uuid)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return schemas.UserResponse.model_validate(user)
+    return user_response(user)
 
 
 @app.get("/api/v1/users", response_model=List[schemas.UserResponse])
@@ -356,24 +480,27 @@ async def list_users(
     skip: int = 0,
     limit: int = 100,
     current_user = Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List all users"""
-    users = db.query(models.User).offset(skip).limit(limit).all()
-    return [schemas.UserResponse.model_validate(user) for user in users]
+    users = (await db.scalars(select(models.User).offset(skip).limit(limit))).all()
+    return Response(
+        content=USER_LIST_ADAPTER.dump_json([user_response(user) for user in users]),
+        media_type="application/json"
+    )
 
 
 @app.get("/api/v1/users/{user_id}", response_model=schemas.UserResponse)
 async def get_user(
-    user_id: str,
+    user_id: UUID,
     current_user = Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get user by ID"""
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await load_user_with_rbac(db, models.User.id == user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return schemas.UserResponse.model_validate(user)
+    return user_response(user)
 
 
 # ============================================
@@ -383,21 +510,27 @@ async def get_user(
 @app.get("/api/v1/roles", response_model=List[schemas.RoleResponse])
 async def list_roles(
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List all roles"""
-    roles = db.query(models.Role).all()
-    return [schemas.RoleResponse.model_validate(role) for role in roles]
+    roles = (await db.scalars(select(models.Role))).all()
+    return Response(
+        content=ROLE_LIST_ADAPTER.dump_json([role_response(role) for role in roles]),
+        media_type="application/json"
+    )
 
 
 @app.get("/api/v1/permissions", response_model=List[schemas.PermissionResponse])
 async def list_permissions(
     current_user = Depends(require_roles([Roles.ADMIN])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List all permissions"""
-    permissions = db.query(models.Permission).all()
-    return [schemas.PermissionResponse.model_validate(perm) for perm in permissions]
+    permissions = (await db.scalars(select(models.Permission))).all()
+    return Response(
+        content=PERMISSION_LIST_ADAPTER.dump_json([permission_response(perm) for perm in permissions]),
+        media_type="application/json"
+    )
 
 
 # ============================================
@@ -86,7 +86,6 @@ class RefreshToken(Base, TimestampMixin):
     token = Column(String(500), unique=True, nullable=False, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
-    is_revoked = Column(Boolean, default=False, nullable=False)
     device_info = Column(String(255))  # Optional: store device/browser info
 
     # Relationships
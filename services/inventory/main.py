@@ -2,43 +2,91 @@
 Inventory Service
 Stock management with append-only movements pattern
 """
-from fastapi import FastAPI, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import FastAPI, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import asynccontextmanager
 from decimal import Decimal
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
-import threading
+import asyncio
 import os
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from shared.database import create_db_engine, get_session_factory, get_db_session, Base
+from shared.database import (
+    create_async_db_engine,
+    get_async_session_factory,
+    get_async_db_session,
+    Base
+)
 from shared.auth import get_current_user, require_roles, Roles
 from shared.logging_config import configure_logging
-from shared.events import EventPublisher, EventConsumer, EventEnvelope
+from shared.events import EventPublisher, EventEnvelope, QueuedEventPublisher
+from shared.async_events import AsyncEventConsumer
 
 import models
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from datetime import datetime
 
 # Initialize
 logger = configure_logging("inventory-service")
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_db_engine(DATABASE_URL)
-SessionFactory = get_session_factory(engine)
-if os.getenv("AUTO_CREATE_DB", "true").lower() == "true":
-    Base.metadata.create_all(bind=engine)
+async_engine = create_async_db_engine(DATABASE_URL)
+AsyncSessionFactory = get_async_session_factory(async_engine)
 
 RABBITMQ_URL = os.getenv("RABBITMQ_URL")
-event_publisher = EventPublisher(RABBITMQ_URL, "inventory-service") if RABBITMQ_URL else None
+# Queued: request handlers and the event consumer hand events to a background flusher
+event_publisher = (
+    QueuedEventPublisher(EventPublisher(RABBITMQ_URL, "inventory-service")) if RABBITMQ_URL else None
+)
 
-app = FastAPI(title="Inventory Service", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize service and cleanup on shutdown"""
+    logger.info("Inventory service starting up")
+    # Create tables (dev only; prefer migrations in prod)
+    if os.getenv("AUTO_CREATE_DB", "true").lower() == "true":
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    if event_publisher:
+        await event_publisher.start()
+
+    # Setup event consumer
+    if RABBITMQ_URL:
+        consumer = AsyncEventConsumer(RABBITMQ_URL, "inventory-service", "inventory_queue")
+        await consumer.connect()
+        consumer.register_handler("sale.created", handle_sale_created)
+        app.state.inventory_consumer = consumer
+        app.state.inventory_consumer_task = asyncio.create_task(consumer.consume())
+
+    yield
+
+    logger.info("Inventory service shutting down")
+    if hasattr(app.state, "inventory_consumer"):
+        app.state.inventory_consumer_task.cancel()
+        await app.state.inventory_consumer.close()
+    if event_publisher:
+        await event_publisher.close()
+    await async_engine.dispose()
 
 
-def get_db():
-    with get_db_session(SessionFactory) as session:
+app = FastAPI(
+    title="Inventory Service",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_db_session(AsyncSessionFactory) as session:
         yield session
 
 
@@ -86,6 +134,10 @@ class StockMovementCreate(BaseModel):
     idempotency_key: Optional[str] = None
 
 
+class StockMovementBulkCreate(BaseModel):
+    movements: List[StockMovementCreate] = Field(min_length=1, max_length=1000)
+
+
 class StockMovementResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -110,6 +162,16 @@ class StockLevel(BaseModel):
     is_below_minimum: bool
 
 
+class CountResponse(BaseModel):
+    count: int
+
+
+# Serializers built once; list handlers validate and dump a whole page per call
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[ProductResponse])
+STOCK_MOVEMENT_LIST_ADAPTER = TypeAdapter(List[StockMovementResponse])
+STOCK_LEVEL_LIST_ADAPTER = TypeAdapter(List[StockLevel])
+
+
 # ============================================
 # Product Endpoints
 # ============================================
@@ -118,17 +180,17 @@ class StockLevel(BaseModel):
 async def create_product(
     product_data: ProductCreate,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new product"""
     # Check if code exists
-    if db.query(models.Product).filter_by(code=product_data.code).first():
+    if await db.scalar(select(models.Product.id).filter_by(code=product_data.code)):
         raise HTTPException(status_code=400, detail="Product code already exists")
 
     product = models.Product(**product_data.model_dump())
     db.add(product)
-    db.commit()
-    db.refresh(product)
+    await db.commit()
+    await db.refresh(product)
 
     if event_publisher:
         event_publisher.publish_event(
@@ -147,25 +209,28 @@ async def list_products(
     skip: int = 0,
     limit: int = 100,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List products"""
-    query = db.query(models.Product).filter_by(is_active=is_active)
+    stmt = select(models.Product).filter_by(is_active=is_active)
     if product_type:
-        query = query.filter_by(product_type=product_type)
+        stmt = stmt.filter_by(product_type=product_type)
 
-    products = query.offset(skip).limit(limit).all()
-    return [ProductResponse.model_validate(p) for p in products]
+    products = (await db.scalars(stmt.offset(skip).limit(limit))).all()
+    return Response(
+        content=PRODUCT_LIST_ADAPTER.dump_json(PRODUCT_LIST_ADAPTER.validate_python(products, from_attributes=True)),
+        media_type="application/json"
+    )
 
 
 @app.get("/api/v1/products/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: UUID,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get product by ID"""
-    product = db.query(models.Product).filter_by(id=product_id).first()
+    product = await db.get(models.Product, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return ProductResponse.model_validate(product)
@@ -179,36 +244,108 @@ async def get_product(
 async def create_stock_movement(
     movement_data: StockMovementCreate,
     current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE, Roles.AGENT_TERRAIN])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a stock movement (append-only)"""
-    # Check product exists
-    product = db.query(models.Product).filter_by(id=movement_data.product_id).first()
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
+    # One statement: the FK checks the product, the unique key absorbs replays
+    try:
+        movement = await db.scalar(
+            pg_insert(models.StockMovement)
+            .values(**movement_data.model_dump(), user_id=current_user.user_uuid)
+            .on_conflict_do_nothing(index_elements=['idempotency_key'])
+            .returning(models.StockMovement)
+        )
+    except IntegrityError as e:
+        if 'stock_movements_product_id_fkey"' in str(e.orig):
+            raise HTTPException(status_code=404, detail="Product not found")
+        raise
+
+    if movement is None:
+        logger.warning("Duplicate movement ignored", idempotency_key=movement_data.idempotency_key)
+        existing = await db.scalar(
+            select(models.StockMovement).filter_by(idempotency_key=movement_data.idempotency_key)
+        )
+        return StockMovementResponse.model_validate(existing)
 
-    # Idempotency check
-    if movement_data.idempotency_key:
-        existing = db.query(models.StockMovement).filter_by(
-            idempotency_key=movement_data.idempotency_key
-        ).first()
-        if existing:
-            logger.warning("Duplicate movement ignored", idempotency_key=movement_data.idempotency_key)
-            return StockMovementResponse.model_validate(existing)
-
-    # Create movement
-    movement = models.StockMovement(
-        **movement_data.model_dump(),
-        user_id=UUID(current_user.user_id)
-    )
-    db.add(movement)
-    db.commit()
-    db.refresh(movement)
+    response = StockMovementResponse.model_validate(movement)
+    await db.commit()
 
     # Publish event
     if event_publisher:
         event_publisher.publish_event(
             f"stock.{movement_data.movement_type.value}",
+            {
+                "movement_id": str(response.id),
+                "product_id": str(response.product_id),
+                "quantity": float(response.quantity),
+                "reference_type": response.reference_type,
+                "reference_id": str(response.reference_id) if response.reference_id else None
+            }
+        )
+
+    logger.info("Stock movement created", movement_id=str(response.id), product_id=str(response.product_id))
+    return response
+
+
+@app.post("/api/v1/stock-movements/bulk", response_model=List[StockMovementResponse], status_code=201)
+async def create_stock_movements_bulk(
+    bulk_data: StockMovementBulkCreate,
+    current_user=Depends(require_roles([Roles.ADMIN, Roles.GESTIONNAIRE, Roles.AGENT_TERRAIN])),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create a batch of stock movements in one transaction (append-only)"""
+    # Check products exist
+    product_ids = {m.product_id for m in bulk_data.movements}
+    found_ids = set(await db.scalars(select(models.Product.id).where(models.Product.id.in_(product_ids))))
+    missing_ids = product_ids - found_ids
+    if missing_ids:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Products not found: {', '.join(sorted(str(pid) for pid in missing_ids))}"
+        )
+
+    # Idempotency check: replayed keys resolve to the stored movement
+    keys = {m.idempotency_key for m in bulk_data.movements if m.idempotency_key}
+    by_key = {
+        movement.idempotency_key: movement
+        for movement in await db.scalars(
+            select(models.StockMovement).where(models.StockMovement.idempotency_key.in_(keys))
+        )
+    } if keys else {}
+    if by_key:
+        logger.warning("Duplicate movements ignored", idempotency_keys=sorted(by_key))
+
+    user_id = current_user.user_uuid
+    rows = []
+    pending_keys = set()
+    for movement_data in bulk_data.movements:
+        key = movement_data.idempotency_key
+        if key in by_key or key in pending_keys:
+            continue
+        if key:
+            pending_keys.add(key)
+        rows.append({**movement_data.model_dump(), "user_id": user_id})
+
+    # One multi-row INSERT ... RETURNING for the whole batch
+    created = list(await db.scalars(
+        insert(models.StockMovement).returning(models.StockMovement, sort_by_parameter_order=True),
+        rows
+    )) if rows else []
+
+    movements = []
+    created_iter = iter(created)
+    for movement_data in bulk_data.movements:
+        key = movement_data.idempotency_key
+        if key not in by_key:
+            movement = next(created_iter)
+            if key:
+                by_key[key] = movement
+        movements.append(by_key[key] if key else movement)
+
+    response = [StockMovementResponse.model_validate(m) for m in movements]
+    events = [
+        (
+            f"stock.{movement.movement_type.value}",
             {
                 "movement_id": str(movement.id),
                 "product_id": str(movement.product_id),
@@ -217,123 +354,137 @@ async def create_stock_movement(
                 "reference_id": str(movement.reference_id) if movement.reference_id else None
             }
         )
+        for movement in created
+    ]
+    await db.commit()
 
-    logger.info("Stock movement created", movement_id=str(movement.id), product_id=str(product.id))
-    return StockMovementResponse.model_validate(movement)
+    # Publish events
+    if event_publisher:
+        for event_type, payload in events:
+            event_publisher.publish_event(event_type, payload)
+
+    logger.info("Stock movements created", count=len(created), replayed=len(movements) - len(created))
+    return response
 
 
 @app.get("/api/v1/stock-movements", response_model=List[StockMovementResponse])
 async def list_stock_movements(
     product_id: Optional[UUID] = None,
     movement_type: Optional[models.MovementType] = None,
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[UUID] = None,
     skip: int = 0,
     limit: int = 100,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """List stock movements"""
-    query = db.query(models.StockMovement)
+    """List stock movements (pass the last movement's created_at/id as after_created_at/after_id for the next page)"""
+    if (after_created_at is None) != (after_id is None):
+        raise HTTPException(status_code=422, detail="after_created_at and after_id must be passed together")
+
+    stmt = select(models.StockMovement)
     if product_id:
-        query = query.filter_by(product_id=product_id)
+        stmt = stmt.filter_by(product_id=product_id)
     if movement_type:
-        query = query.filter_by(movement_type=movement_type)
+        stmt = stmt.filter_by(movement_type=movement_type)
+    if after_created_at and after_id:
+        stmt = stmt.where(
+            tuple_(models.StockMovement.created_at, models.StockMovement.id) < tuple_(after_created_at, after_id)
+        )
 
-    movements = query.order_by(models.StockMovement.created_at.desc()).offset(skip).limit(limit).all()
-    return [StockMovementResponse.model_validate(m) for m in movements]
+    movements = (await db.scalars(stmt.order_by(
+        models.StockMovement.created_at.desc(), models.StockMovement.id.desc()
+    ).offset(skip).limit(limit))).all()
+    return Response(
+        content=STOCK_MOVEMENT_LIST_ADAPTER.dump_json(
+            STOCK_MOVEMENT_LIST_ADAPTER.validate_python(movements, from_attributes=True)
+        ),
+        media_type="application/json"
+    )
 
 
 # ============================================
 # Stock Level Queries
 # ============================================
 
+# Running balance per product (0 before its first movement); the minimum check runs in the same query
+CURRENT_STOCK = func.coalesce(models.ProductStock.current_stock, 0)
+
+
+def stock_level_query():
+    """One row per product shaped like StockLevel, read from the running balances"""
+    return select(
+        models.Product.id.label('product_id'),
+        models.Product.code.label('product_code'),
+        models.Product.name.label('product_name'),
+        CURRENT_STOCK.label('current_stock'),
+        models.Product.unit,
+        models.Product.min_stock_level,
+        (CURRENT_STOCK < models.Product.min_stock_level).label('is_below_minimum')
+    ).outerjoin(models.ProductStock)
+
+
 @app.get("/api/v1/stock-levels", response_model=List[StockLevel])
 async def get_stock_levels(
     product_type: Optional[models.ProductType] = None,
     below_minimum: bool = False,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get current stock levels for all products"""
-    # Query to calculate current stock from movements
-    query = db.query(
-        models.Product.id,
-        models.Product.code,
-        models.Product.name,
-        models.Product.unit,
-        models.Product.min_stock_level,
-        func.coalesce(func.sum(models.StockMovement.quantity), 0).label('current_stock')
-    ).outerjoin(
-        models.StockMovement,
-        models.Product.id == models.StockMovement.product_id
-    ).filter(
-        models.Product.is_active == 1
-    )
+    stmt = stock_level_query().where(models.Product.is_active == 1)
 
     if product_type:
-        query = query.filter(models.Product.product_type == product_type)
+        stmt = stmt.where(models.Product.product_type == product_type)
 
-    query = query.group_by(
-        models.Product.id,
-        models.Product.code,
-        models.Product.name,
-        models.Product.unit,
-        models.Product.min_stock_level
+    if below_minimum:
+        stmt = stmt.where(CURRENT_STOCK < models.Product.min_stock_level)
+
+    rows = (await db.execute(stmt)).mappings().all()
+    return Response(
+        content=STOCK_LEVEL_LIST_ADAPTER.dump_json([StockLevel.model_construct(**row) for row in rows]),
+        media_type="application/json"
     )
 
-    results = query.all()
 
-    stock_levels = []
-    for row in results:
-        is_below = row.current_stock < row.min_stock_level
-        if below_minimum and not is_below:
-            continue
+@app.get("/api/v1/stock-levels/count", response_model=CountResponse)
+async def count_stock_levels(
+    product_type: Optional[models.ProductType] = None,
+    below_minimum: bool = False,
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Count active products, optionally only those below their minimum stock"""
+    stmt = select(func.count()).select_from(models.Product).where(models.Product.is_active == 1)
+
+    if product_type:
+        stmt = stmt.where(models.Product.product_type == product_type)
 
-        stock_levels.append(StockLevel(
-            product_id=row.id,
-            product_code=row.code,
-            product_name=row.name,
-            current_stock=Decimal(str(row.current_stock)),
-            unit=row.unit,
-            min_stock_level=row.min_stock_level,
-            is_below_minimum=is_below
-        ))
+    if below_minimum:
+        stmt = stmt.outerjoin(models.ProductStock).where(CURRENT_STOCK < models.Product.min_stock_level)
 
-    return stock_levels
+    return CountResponse(count=await db.scalar(stmt))
 
 
 @app.get("/api/v1/stock-levels/{product_id}", response_model=StockLevel)
 async def get_product_stock_level(
     product_id: UUID,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get stock level for a specific product"""
-    product = db.query(models.Product).filter_by(id=product_id).first()
-    if not product:
+    row = (await db.execute(stock_level_query().where(models.Product.id == product_id))).mappings().first()
+    if not row:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    current_stock = db.query(
-        func.coalesce(func.sum(models.StockMovement.quantity), 0)
-    ).filter(
-        models.StockMovement.product_id == product_id
-    ).scalar()
-
-    return StockLevel(
-        product_id=product.id,
-        product_code=product.code,
-        product_name=product.name,
-        current_stock=Decimal(str(current_stock)),
-        unit=product.unit,
-        min_stock_level=product.min_stock_level,
-        is_below_minimum=current_stock < product.min_stock_level
-    )
+    return StockLevel.model_construct(**row)
 
 
 # ============================================
 # Event Handlers
 # ============================================
 
-def handle_sale_created(event: EventEnvelope):
+async def handle_sale_created(event: EventEnvelope):
     """Handle sale.created event - decrement stock"""
     logger.info("Handling sale.created event", event_id=event.event_id)
     payload = event.payload
@@ -344,24 +495,31 @@ def handle_sale_created(event: EventEnvelope):
         logger.warning("Missing sale_id or lines in sale.created event", event_id=event.event_id)
         return
 
-    with get_db_session(SessionFactory) as db:
-        # Validate stock availability
-        for line in lines:
-            product_id_str = line.get("product_id")
-            quantity_raw = line.get("quantity")
-
-            if not product_id_str or quantity_raw is None:
-                logger.warning("Missing product info in sale.created event", sale_id=sale_id)
-                return
-
-            product_id = UUID(product_id_str)
-            quantity = Decimal(str(quantity_raw))
-            if quantity <= 0:
-                logger.warning("Invalid quantity in sale.created event", sale_id=sale_id, quantity=quantity_raw)
-                return
-
-            product = db.query(models.Product).filter_by(id=product_id).first()
-            if not product:
+    sale_lines = []
+    for line in lines:
+        product_id_str = line.get("product_id")
+        quantity_raw = line.get("quantity")
+
+        if not product_id_str or quantity_raw is None:
+            logger.warning("Missing product info in sale.created event", sale_id=sale_id)
+            return
+
+        quantity = Decimal(str(quantity_raw))
+        if quantity <= 0:
+            logger.warning("Invalid quantity in sale.created event", sale_id=sale_id, quantity=quantity_raw)
+            return
+        sale_lines.append((product_id_str, UUID(product_id_str), quantity))
+
+    async with get_async_db_session(AsyncSessionFactory) as db:
+        # Validate stock availability: one query for every product of the sale
+        stock_by_product = dict((await db.execute(
+            select(models.Product.id, CURRENT_STOCK)
+            .outerjoin(models.ProductStock)
+            .where(models.Product.id.in_({product_id for _, product_id, _ in sale_lines}))
+        )).all())
+
+        for product_id_str, product_id, quantity in sale_lines:
+            if product_id not in stock_by_product:
                 if event_publisher:
                     event_publisher.publish_event(
                         "stock.failed",
@@ -369,13 +527,7 @@ def handle_sale_created(event: EventEnvelope):
                     )
                 return
 
-            current_stock = db.query(
-                func.coalesce(func.sum(models.StockMovement.quantity), 0)
-            ).filter(
-                models.StockMovement.product_id == product_id
-            ).scalar()
-
-            if Decimal(str(current_stock)) < quantity:
+            if Decimal(str(stock_by_product[product_id])) < quantity:
                 if event_publisher:
                     event_publisher.publish_event(
                         "stock.failed",
@@ -383,32 +535,36 @@ def handle_sale_created(event: EventEnvelope):
                     )
                 return
 
-        # Create stock movements
-        movement_ids = []
-        for line in lines:
-            product_id = UUID(line["product_id"])
-            quantity = Decimal(str(line["quantity"]))
-            idempotency_key = f"sale_{sale_id}_{product_id}"
-
-            existing = db.query(models.StockMovement).filter_by(idempotency_key=idempotency_key).first()
-            if existing:
-                movement_ids.append(str(existing.id))
-                continue
-
-            movement = models.StockMovement(
-                product_id=product_id,
-                movement_type=models.MovementType.SORTIE,
-                quantity=-abs(quantity),
-                reference_type="sale",
-                reference_id=UUID(sale_id),
-                notes="Auto-decrement from sale",
-                idempotency_key=idempotency_key
-            )
-            db.add(movement)
-            db.flush()
-            movement_ids.append(str(movement.id))
-
-        db.commit()
+        # Create stock movements: one multi-row INSERT, replayed keys are skipped by the unique index
+        keys = [f"sale_{sale_id}_{product_id}" for _, product_id, _ in sale_lines]
+        rows = {
+            key: {
+                "product_id": product_id,
+                "movement_type": models.MovementType.SORTIE,
+                "quantity": -abs(quantity),
+                "reference_type": "sale",
+                "reference_id": UUID(sale_id),
+                "notes": "Auto-decrement from sale",
+                "idempotency_key": key
+            }
+            for key, (_, product_id, quantity) in zip(keys, sale_lines)
+        }
+        ids_by_key = dict((await db.execute(
+            pg_insert(models.StockMovement)
+            .values(list(rows.values()))
+            .on_conflict_do_nothing(index_elements=['idempotency_key'])
+            .returning(models.StockMovement.idempotency_key, models.StockMovement.id)
+        )).all())
+
+        replayed = set(rows) - set(ids_by_key)
+        if replayed:
+            ids_by_key.update((await db.execute(
+                select(models.StockMovement.idempotency_key, models.StockMovement.id)
+                .where(models.StockMovement.idempotency_key.in_(replayed))
+            )).all())
+        movement_ids = [str(ids_by_key[key]) for key in keys]
+
+        await db.commit()
 
     if event_publisher:
         event_publisher.publish_event(
@@ -417,34 +573,6 @@ def handle_sale_created(event: EventEnvelope):
         )
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize service"""
-    logger.info("Inventory service starting up")
-    if event_publisher:
-        event_publisher.connect()
-
-    # Setup event consumer
-    if RABBITMQ_URL:
-        consumer = EventConsumer(RABBITMQ_URL, "inventory-service", "inventory_queue")
-        consumer.connect()
-        consumer.register_handler("sale.created", handle_sale_created)
-        app.state.inventory_consumer = consumer
-        consumer_thread = threading.Thread(target=consumer.start_consuming, daemon=True)
-        consumer_thread.start()
-        app.state.inventory_consumer_thread = consumer_thread
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup"""
-    logger.info("Inventory service shutting down")
-    if event_publisher:
-        event_publisher.close()
-    if hasattr(app.state, "inventory_consumer"):
-        app.state.inventory_consumer.stop_consuming()
-
-
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "inventory-service"}
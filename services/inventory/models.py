@@ -2,7 +2,7 @@
 Inventory Service Database Models
 Products, Stock Movements (append-only pattern)
 """
-from sqlalchemy import Column, String, Integer, Enum as SQLEnum, Numeric, ForeignKey, Index
+from sqlalchemy import Column, DDL, String, Integer, Enum as SQLEnum, Numeric, ForeignKey, Index, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -65,8 +65,8 @@ class StockMovement(Base, TimestampMixin):
     __tablename__ = 'stock_movements'
 
     __table_args__ = (
-        Index('idx_product_movement', 'product_id', 'movement_type'),
-        Index('idx_movement_date', 'created_at'),
+        Index('idx_movement_product_date_id', 'product_id', 'created_at', 'id'),  # Per-product history pages
+        Index('idx_movement_date_id', 'created_at', 'id'),  # Date order + keyset pagination
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -88,3 +88,40 @@ class StockMovement(Base, TimestampMixin):
 
     # Relationships
     product = relationship('Product', back_populates='movements')
+
+
+class ProductStock(Base):
+    """
+    Running stock balance per product
+    Maintained by a trigger on stock_movements; never written by the application
+    """
+    __tablename__ = 'product_stock'
+
+    product_id = Column(UUID(as_uuid=True), ForeignKey('products.id', ondelete='CASCADE'), primary_key=True)
+    current_stock = Column(Numeric(12, 3), nullable=False, default=0)
+
+
+# Movements are append-only, so an AFTER INSERT trigger keeps product_stock exact.
+# Statement level with a transition table: a bulk insert updates each product once.
+PRODUCT_STOCK_TRIGGER_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION apply_stock_movements() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO product_stock (product_id, current_stock)
+        SELECT product_id, SUM(quantity) FROM new_movements GROUP BY product_id
+        ON CONFLICT (product_id)
+        DO UPDATE SET current_stock = product_stock.current_stock + EXCLUDED.current_stock;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_stock_movements_balance
+    AFTER INSERT ON stock_movements
+    REFERENCING NEW TABLE AS new_movements
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_stock_movements()
+    """,
+)
+
+for statement in PRODUCT_STOCK_TRIGGER_DDL:
+    event.listen(StockMovement.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
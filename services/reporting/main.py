@@ -6,9 +6,11 @@ from fastapi import FastAPI, Depends, HTTPException, Query, BackgroundTasks
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
 import os
 import sys
 import json
@@ -27,7 +29,9 @@ from pydantic import BaseModel, ConfigDict, Field
 
 # Excel and PDF libraries
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.utils import get_column_letter
 from weasyprint import HTML, CSS
 import httpx
 
@@ -78,6 +82,16 @@ INVENTORY_SERVICE_URL = os.getenv("INVENTORY_SERVICE_URL", "http://inventory-ser
 SALES_SERVICE_URL = os.getenv("SALES_SERVICE_URL", "http://sales-service:8000")
 ACCOUNTING_SERVICE_URL = os.getenv("ACCOUNTING_SERVICE_URL", "http://accounting-service:8000")
 
+# Report rendering is CPU-bound (openpyxl, WeasyPrint); run it in worker processes
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", str(os.cpu_count() or 1)))
+report_pool = ProcessPoolExecutor(max_workers=REPORT_WORKERS)
+
+# One pooled HTTP client for all service calls (opened at startup)
+HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+)
+
 app = FastAPI(
     title="Reporting & Export Service",
     description="Generate PDF and Excel reports with MinIO storage",
@@ -172,15 +186,19 @@ class DashboardData(BaseModel):
 async def fetch_service_data(url: str, headers: Dict[str, str]) -> Optional[Dict]:
     """Fetch data from another service"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await app.state.http_client.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         logger.error(f"Error fetching from {url}: {e}")
         return None
 
 
+async def fetch_many(urls: List[str], headers: Dict[str, str]) -> List[Optional[Dict]]:
+    """Fetch from several services concurrently (None for each failed call)"""
+    return await asyncio.gather(*(fetch_service_data(url, headers) for url in urls))
+
+
 def upload_to_minio(file_content: bytes, file_name: str, content_type: str) -> Optional[str]:
     """Upload file to MinIO and return path"""
     if not minio_client:
@@ -224,192 +242,138 @@ def download_from_minio(file_path: str) -> Optional[bytes]:
 # Excel Generation Functions
 # ============================================
 
-def generate_excel_sales_summary(data: Dict, filters: Dict) -> bytes:
-    """Generate Excel sales summary report"""
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sales Summary"
-
-    # Header styling
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True, size=12)
-    header_alignment = Alignment(horizontal="center", vertical="center")
-
-    # Title
-    ws.merge_cells('A1:F1')
-    ws['A1'] = "Sales Summary Report"
-    ws['A1'].font = Font(bold=True, size=16)
-    ws['A1'].alignment = Alignment(horizontal="center")
-
-    # Filters info
-    row = 3
-    if filters:
-        ws[f'A{row}'] = f"Period: {filters.get('date_from', 'N/A')} to {filters.get('date_to', 'N/A')}"
-        row += 2
-
-    # Column headers
-    headers = ["Date", "Sale Number", "Customer", "Items", "Amount (FCFA)", "Status"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=row, column=col)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-
-    # Sample data (in real implementation, fetch from sales service)
-    # This is placeholder - actual implementation would fetch real data
-    row += 1
-    sample_data = data.get('sales', [])
-    for sale in sample_data:
-        ws.cell(row=row, column=1, value=sale.get('sale_date'))
-        ws.cell(row=row, column=2, value=sale.get('sale_number'))
-        ws.cell(row=row, column=3, value=sale.get('customer_name'))
-        ws.cell(row=row, column=4, value=sale.get('item_count'))
-        ws.cell(row=row, column=5, value=sale.get('total_amount', 0) / 100)
-        ws.cell(row=row, column=6, value=sale.get('status'))
-        row += 1
-
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(cell.value)
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-
-    # Save to bytes
+# Shared report styles, built once
+TITLE_FONT = Font(bold=True, size=16)
+TITLE_ALIGNMENT = Alignment(horizontal="center")
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+HEADER_FONT = Font(color="FFFFFF", bold=True, size=12)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+LOW_STOCK_STYLE = (PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid"), Font(color="FFFFFF", bold=True))
+
+CellStyles = Callable[[tuple], Dict[int, Tuple[PatternFill, Font]]]
+
+
+def styled_cell(ws, value, fill: Optional[PatternFill] = None, font: Optional[Font] = None,
+                alignment: Optional[Alignment] = None) -> WriteOnlyCell:
+    """Write-only cell with optional styling"""
+    cell = WriteOnlyCell(ws, value=value)
+    if fill:
+        cell.fill = fill
+    if font:
+        cell.font = font
+    if alignment:
+        cell.alignment = alignment
+    return cell
+
+
+def render_excel(
+    sheet_title: str,
+    title: str,
+    headers: List[str],
+    rows: List[tuple],
+    notes: Iterable[str] = (),
+    cell_styles: Optional[CellStyles] = None
+) -> bytes:
+    """Render a titled table as a write-only workbook
+
+    cell_styles maps a row to {column index: (fill, font)} for cells that
+    need highlighting.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+
+    # Write-only sheets emit column widths before the first row
+    widths = [len(header) for header in headers]
+    for values in rows:
+        for i, value in enumerate(values):
+            if value is not None:
+                widths[i] = max(widths[i], len(str(value)))
+    for i, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(i)].width = min(width + 2, 50)
+
+    ws.merged_cells.add(f"A1:{get_column_letter(len(headers))}1")
+    ws.append([styled_cell(ws, title, font=TITLE_FONT, alignment=TITLE_ALIGNMENT)])
+    ws.append([])
+    for note in notes:
+        ws.append([note])
+        ws.append([])
+
+    ws.append([styled_cell(ws, header, HEADER_FILL, HEADER_FONT, HEADER_ALIGNMENT) for header in headers])
+    for values in rows:
+        styles = cell_styles(values) if cell_styles else None
+        if styles:
+            values = [
+                styled_cell(ws, value, *styles[i]) if i in styles else value
+                for i, value in enumerate(values)
+            ]
+        ws.append(values)
+
     excel_buffer = io.BytesIO()
     wb.save(excel_buffer)
-    excel_buffer.seek(0)
-    return excel_buffer.read()
+    return excel_buffer.getvalue()
+
+
+def generate_excel_sales_summary(data: Dict, filters: Dict) -> bytes:
+    """Generate Excel sales summary report"""
+    rows = [
+        (
+            sale.get('sale_date'),
+            sale.get('sale_number'),
+            sale.get('customer_name'),
+            sale.get('item_count'),
+            sale.get('total_amount', 0) / 100,
+            sale.get('status')
+        )
+        for sale in data.get('sales', [])
+    ]
+    notes = [f"Period: {filters.get('date_from', 'N/A')} to {filters.get('date_to', 'N/A')}"] if filters else []
+    return render_excel(
+        "Sales Summary", "Sales Summary Report",
+        ["Date", "Sale Number", "Customer", "Items", "Amount (FCFA)", "Status"],
+        rows, notes
+    )
 
 
 def generate_excel_inventory_status(data: Dict, filters: Dict) -> bytes:
     """Generate Excel inventory status report"""
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Inventory Status"
-
-    # Header styling
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True, size=12)
-
-    # Title
-    ws.merge_cells('A1:G1')
-    ws['A1'] = "Inventory Status Report"
-    ws['A1'].font = Font(bold=True, size=16)
-    ws['A1'].alignment = Alignment(horizontal="center")
-
-    # Column headers
-    row = 3
-    headers = ["Product Code", "Product Name", "Type", "Current Stock", "Unit", "Min Level", "Status"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=row, column=col)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center")
-
-    # Data
-    row += 1
-    stock_levels = data.get('stock_levels', [])
-    for item in stock_levels:
-        ws.cell(row=row, column=1, value=item.get('product_code'))
-        ws.cell(row=row, column=2, value=item.get('product_name'))
-        ws.cell(row=row, column=3, value=item.get('product_type'))
-        ws.cell(row=row, column=4, value=float(item.get('current_stock', 0)))
-        ws.cell(row=row, column=5, value=item.get('unit'))
-        ws.cell(row=row, column=6, value=item.get('min_stock_level'))
-
-        # Status with conditional formatting
-        is_below = item.get('is_below_minimum', False)
-        status_cell = ws.cell(row=row, column=7)
-        status_cell.value = "LOW STOCK" if is_below else "OK"
-        if is_below:
-            status_cell.fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-            status_cell.font = Font(color="FFFFFF", bold=True)
-
-        row += 1
-
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(cell.value)
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-
-    excel_buffer = io.BytesIO()
-    wb.save(excel_buffer)
-    excel_buffer.seek(0)
-    return excel_buffer.read()
+    rows = [
+        (
+            item.get('product_code'),
+            item.get('product_name'),
+            item.get('product_type'),
+            float(item.get('current_stock', 0)),
+            item.get('unit'),
+            item.get('min_stock_level'),
+            "LOW STOCK" if item.get('is_below_minimum', False) else "OK"
+        )
+        for item in data.get('stock_levels', [])
+    ]
+    return render_excel(
+        "Inventory Status", "Inventory Status Report",
+        ["Product Code", "Product Name", "Type", "Current Stock", "Unit", "Min Level", "Status"],
+        rows,
+        cell_styles=lambda values: {6: LOW_STOCK_STYLE} if values[6] == "LOW STOCK" else {}
+    )
 
 
 def generate_excel_tva_monthly(data: Dict, filters: Dict) -> bytes:
     """Generate Excel monthly TVA report"""
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "TVA Monthly"
-
-    # Header styling
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True, size=12)
-
-    # Title
-    ws.merge_cells('A1:F1')
-    ws['A1'] = "Monthly TVA Report"
-    ws['A1'].font = Font(bold=True, size=16)
-    ws['A1'].alignment = Alignment(horizontal="center")
-
-    # Column headers
-    row = 3
-    headers = ["Month", "TVA Collectée", "TVA Déductible", "TVA Net", "Sales Count", "Purchase Count"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=row, column=col)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center")
-
-    # Data
-    row += 1
-    tva_data = data.get('tva_reports', [])
-    for item in tva_data:
-        ws.cell(row=row, column=1, value=item.get('fiscal_month'))
-        ws.cell(row=row, column=2, value=item.get('tva_collectee', 0) / 100)
-        ws.cell(row=row, column=3, value=item.get('tva_deductible', 0) / 100)
-        ws.cell(row=row, column=4, value=item.get('tva_net', 0) / 100)
-        ws.cell(row=row, column=5, value=item.get('sales_count'))
-        ws.cell(row=row, column=6, value=item.get('purchases_count'))
-        row += 1
-
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(cell.value)
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-
-    excel_buffer = io.BytesIO()
-    wb.save(excel_buffer)
-    excel_buffer.seek(0)
-    return excel_buffer.read()
+    rows = [
+        (
+            item.get('fiscal_month'),
+            item.get('tva_collectee', 0) / 100,
+            item.get('tva_deductible', 0) / 100,
+            item.get('tva_net', 0) / 100,
+            item.get('sales_count'),
+            item.get('purchases_count')
+        )
+        for item in data.get('tva_reports', [])
+    ]
+    return render_excel(
+        "TVA Monthly", "Monthly TVA Report",
+        ["Month", "TVA Collectée", "TVA Déductible", "TVA Net", "Sales Count", "Purchase Count"],
+        rows
+    )
 
 
 # ============================================
@@ -646,7 +610,7 @@ async def create_report(
         report_date=report_data.report_date,
         filters=json.dumps(report_data.filters) if report_data.filters else None,
         template_id=report_data.template_id,
-        user_id=UUID(current_user.user_id),
+        user_id=current_user.user_uuid,
         status=models.ReportStatus.PROCESSING
     )
     db.add(report)
@@ -677,42 +641,48 @@ async def create_report(
                 'total_customers': 0
             }
 
-        # Generate file based on format
-        file_content = None
+        # Pick the generator based on format
+        generator = None
         content_type = None
         file_extension = None
 
         if report_data.report_format == models.ReportFormat.PDF:
             if report_data.report_type == models.ReportType.SALES_SUMMARY:
-                file_content = generate_pdf_sales_summary(data, filters)
+                generator, args = generate_pdf_sales_summary, (data, filters)
             elif report_data.report_type == models.ReportType.DASHBOARD:
-                file_content = generate_pdf_dashboard(data)
+                generator, args = generate_pdf_dashboard, (data,)
             else:
-                file_content = generate_pdf_sales_summary(data, filters)  # Default
+                generator, args = generate_pdf_sales_summary, (data, filters)  # Default
 
             content_type = "application/pdf"
             file_extension = "pdf"
 
         elif report_data.report_format == models.ReportFormat.EXCEL:
             if report_data.report_type == models.ReportType.SALES_SUMMARY:
-                file_content = generate_excel_sales_summary(data, filters)
+                generator = generate_excel_sales_summary
             elif report_data.report_type == models.ReportType.INVENTORY_STATUS:
-                file_content = generate_excel_inventory_status(data, filters)
+                generator = generate_excel_inventory_status
             elif report_data.report_type == models.ReportType.TVA_MONTHLY:
-                file_content = generate_excel_tva_monthly(data, filters)
+                generator = generate_excel_tva_monthly
             else:
-                file_content = generate_excel_sales_summary(data, filters)  # Default
+                generator = generate_excel_sales_summary  # Default
+            args = (data, filters)
 
             content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             file_extension = "xlsx"
 
+        # Render in the process pool so the event loop keeps serving requests
+        file_content = None
+        if generator:
+            file_content = await asyncio.get_running_loop().run_in_executor(report_pool, generator, *args)
+
         if file_content:
             # Generate filename
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             file_name = f"{report_data.report_type.value}_{timestamp}.{file_extension}"
 
-            # Upload to MinIO
-            file_path = upload_to_minio(file_content, file_name, content_type)
+            # Upload to MinIO (blocking client, run in a thread)
+            file_path = await asyncio.to_thread(upload_to_minio, file_content, file_name, content_type)
 
             # Update report
             end_time = datetime.now()
@@ -763,7 +733,7 @@ async def list_reports(
 
     # Filter by user (non-admin users only see their own reports)
     if not any(role in current_user.roles for role in [Roles.ADMIN, Roles.COMPTABLE]):
-        query = query.filter_by(user_id=UUID(current_user.user_id))
+        query = query.filter_by(user_id=current_user.user_uuid)
 
     if report_type:
         query = query.filter_by(report_type=report_type)
@@ -885,7 +855,7 @@ async def create_template(
         template_config=json.dumps(template_data.template_config) if template_data.template_config else None,
         default_filters=json.dumps(template_data.default_filters) if template_data.default_filters else None,
         excel_config=json.dumps(template_data.excel_config) if template_data.excel_config else None,
-        created_by_user_id=UUID(current_user.user_id)
+        created_by_user_id=current_user.user_uuid
     )
     db.add(template)
     db.commit()
@@ -935,6 +905,7 @@ async def get_template(
 async def startup_event():
     """Initialize service"""
     logger.info("Reporting service starting up")
+    app.state.http_client = httpx.AsyncClient(timeout=30.0, limits=HTTP_LIMITS)
     if event_publisher:
         event_publisher.connect()
 
@@ -943,6 +914,8 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup"""
     logger.info("Reporting service shutting down")
+    await app.state.http_client.aclose()
+    report_pool.shutdown(cancel_futures=True)
     if event_publisher:
         event_publisher.close()
 
@@ -150,6 +150,40 @@ class PaymentResponse(BaseModel):
     created_at: datetime
 
 
+class CountResponse(BaseModel):
+    count: int
+
+
+class SalesDayResponse(BaseModel):
+    sale_date: str
+    sales_count: int
+    total_amount: int
+
+
+class TopCustomerResponse(BaseModel):
+    customer_id: UUID
+    customer_name: str
+    sales_count: int
+    total_amount: int
+
+
+class TopProductResponse(BaseModel):
+    product_id: UUID
+    product_code: str
+    product_name: str
+    quantity: Decimal
+    total_amount: int
+
+
+class SalesAnalyticsResponse(BaseModel):
+    total_sales: int
+    total_amount: int
+    average_sale: float
+    sales_by_day: List[SalesDayResponse]
+    top_customers: List[TopCustomerResponse]
+    top_products: List[TopProductResponse]
+
+
 # ============================================
 # Customer Endpoints
 # ============================================
@@ -290,7 +324,7 @@ async def create_sale(
         total_amount=total_amount,
         notes=sale_data.notes,
         delivery_address=sale_data.delivery_address,
-        created_by_user_id=UUID(current_user.user_id),
+        created_by_user_id=current_user.user_uuid,
         idempotency_key=sale_data.idempotency_key,
         correlation_id=correlation_id
     )
@@ -384,6 +418,95 @@ async def list_sales(
     return [SaleResponse.model_validate(s) for s in sales]
 
 
+@app.get("/api/v1/sales/count", response_model=CountResponse)
+async def count_sales(
+    customer_id: Optional[UUID] = None,
+    status: Optional[models.SaleStatus] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Count sales with filters"""
+    query = db.query(models.Sale)
+
+    if customer_id:
+        query = query.filter_by(customer_id=customer_id)
+    if status:
+        query = query.filter_by(status=status)
+    if from_date:
+        query = query.filter(models.Sale.sale_date >= from_date)
+    if to_date:
+        query = query.filter(models.Sale.sale_date <= to_date)
+
+    return CountResponse(count=query.with_entities(func.count()).scalar())
+
+
+@app.get("/api/v1/sales/analytics", response_model=SalesAnalyticsResponse)
+async def get_sales_analytics(
+    status: Optional[models.SaleStatus] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    top: int = Query(10, ge=1, le=100),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Sales totals, daily series and top customers/products aggregated in SQL"""
+    conditions = []
+    if status:
+        conditions.append(models.Sale.status == status)
+    if from_date:
+        conditions.append(models.Sale.sale_date >= from_date)
+    if to_date:
+        conditions.append(models.Sale.sale_date <= to_date)
+
+    sales_count = func.count(models.Sale.id)
+    sales_total = func.coalesce(func.sum(models.Sale.total_amount), 0)
+
+    total_sales, total_amount = db.query(sales_count, sales_total).filter(*conditions).one()
+
+    by_day = db.query(models.Sale.sale_date, sales_count, sales_total).filter(
+        *conditions
+    ).group_by(models.Sale.sale_date).order_by(models.Sale.sale_date).all()
+
+    top_customers = db.query(
+        models.Customer.id, models.Customer.name, sales_count, sales_total
+    ).join(models.Sale, models.Sale.customer_id == models.Customer.id).filter(
+        *conditions
+    ).group_by(models.Customer.id).order_by(sales_total.desc()).limit(top).all()
+
+    line_total = func.sum(models.SaleLine.line_total)
+    top_products = db.query(
+        models.SaleLine.product_id,
+        func.max(models.SaleLine.product_code),
+        func.max(models.SaleLine.product_name),
+        func.sum(models.SaleLine.quantity),
+        line_total
+    ).join(models.Sale, models.Sale.id == models.SaleLine.sale_id).filter(
+        *conditions
+    ).group_by(models.SaleLine.product_id).order_by(line_total.desc()).limit(top).all()
+
+    return SalesAnalyticsResponse(
+        total_sales=total_sales,
+        total_amount=total_amount,
+        average_sale=total_amount / total_sales if total_sales > 0 else 0,
+        sales_by_day=[
+            SalesDayResponse(sale_date=day, sales_count=count, total_amount=amount)
+            for day, count, amount in by_day
+        ],
+        top_customers=[
+            TopCustomerResponse(customer_id=cid, customer_name=name, sales_count=count, total_amount=amount)
+            for cid, name, count, amount in top_customers
+        ],
+        top_products=[
+            TopProductResponse(
+                product_id=pid, product_code=code, product_name=name, quantity=quantity, total_amount=amount
+            )
+            for pid, code, name, quantity, amount in top_products
+        ]
+    )
+
+
 @app.get("/api/v1/sales/{sale_id}", response_model=SaleResponse)
 async def get_sale(
     sale_id: UUID,
@@ -432,7 +555,7 @@ async def create_payment(
         transaction_reference=payment_data.transaction_reference,
         receipt_number=payment_data.receipt_number,
         notes=payment_data.notes,
-        processed_by_user_id=UUID(current_user.user_id),
+        processed_by_user_id=current_user.user_uuid,
         idempotency_key=payment_data.idempotency_key
     )
     db.add(payment)
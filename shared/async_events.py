@@ -0,0 +1,221 @@
+"""
+Asyncio RabbitMQ consumer (aio-pika)
+Runs inside the service event loop instead of a blocking consumer thread
+"""
+import asyncio
+import json
+import os
+from typing import Dict, Callable, List, Set, Tuple
+
+import aio_pika
+import structlog
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+
+from shared.events import EventEnvelope
+
+logger = structlog.get_logger()
+
+# Operational failures (database restart, pool checkout timeout, lost connection) are
+# requeued; any other handler error comes from the event itself and cannot succeed on retry
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError, TimeoutError, OSError)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether a handler error is worth redelivering the event for"""
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+class AsyncEventConsumer:
+    """aio-pika event consumer with async handler registration"""
+
+    def __init__(self, rabbitmq_url: str, service_name: str, queue_name: str):
+        self.rabbitmq_url = rabbitmq_url
+        self.service_name = service_name
+        self.queue_name = queue_name
+        self.connection = None
+        self.channel = None
+        self.exchange = None
+        self.queue = None
+        self.handlers: Dict[str, Callable] = {}
+        self.batch_handlers: Dict[str, Tuple[Callable, int, float]] = {}
+        self._batches: Dict[Callable, List[Tuple[EventEnvelope, aio_pika.abc.AbstractIncomingMessage]]] = {}
+        self._flush_tasks: Set[asyncio.Task] = set()  # Timer flushes, referenced until done
+        self.processed_events = set()  # Simple idempotency check
+        # Pause before requeuing after a transient failure so an outage is not a redelivery spin
+        self.retry_delay = float(os.getenv("EVENT_RETRY_DELAY_SECONDS", "1"))
+
+    async def connect(self):
+        """Establish connection to RabbitMQ"""
+        retries = int(os.getenv("RABBITMQ_CONNECT_RETRIES", "10"))
+        delay_s = float(os.getenv("RABBITMQ_CONNECT_DELAY_SECONDS", "2"))
+        last_error = None
+
+        for attempt in range(1, retries + 1):
+            try:
+                self.connection = await aio_pika.connect_robust(self.rabbitmq_url)
+                self.channel = await self.connection.channel()
+                self.exchange = await self.channel.declare_exchange(
+                    'domain_events',
+                    aio_pika.ExchangeType.TOPIC,
+                    durable=True
+                )
+                self.queue = await self.channel.declare_queue(self.queue_name, durable=True)
+                logger.info("Event consumer connected", service=self.service_name, queue=self.queue_name)
+                return
+            except Exception as e:
+                last_error = e
+                logger.error(
+                    "Failed to connect event consumer",
+                    error=str(e),
+                    service=self.service_name,
+                    queue=self.queue_name,
+                    attempt=attempt,
+                    retries=retries,
+                )
+                await asyncio.sleep(delay_s)
+
+        raise last_error
+
+    def register_handler(self, event_type: str, handler: Callable):
+        """Register an async handler for a specific event type"""
+        self.handlers[event_type] = handler
+        logger.info("Event handler registered", event_type=event_type, service=self.service_name)
+
+    def register_batch_handler(
+        self,
+        event_type: str,
+        handler: Callable,
+        batch_size: int = 50,
+        max_wait_ms: int = 100
+    ):
+        """Register an async handler called with lists of events, flushed by size or age"""
+        self.batch_handlers[event_type] = (handler, batch_size, max_wait_ms / 1000)
+        logger.info(
+            "Event batch handler registered",
+            event_type=event_type,
+            batch_size=batch_size,
+            service=self.service_name
+        )
+
+    async def _enqueue(self, event: EventEnvelope, message):
+        """Buffer an event for its batch handler"""
+        handler, batch_size, max_wait = self.batch_handlers[event.event_type]
+        batch = self._batches.setdefault(handler, [])
+        batch.append((event, message))
+
+        if len(batch) >= batch_size:
+            await self._flush_batch(handler)
+        elif len(batch) == 1:
+            asyncio.get_running_loop().call_later(max_wait, self._schedule_flush, handler)
+
+    def _schedule_flush(self, handler: Callable):
+        """Start a timer flush, keeping a reference so the task is not garbage-collected"""
+        task = asyncio.create_task(self._flush_batch(handler))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._on_flush_done)
+
+    def _on_flush_done(self, task: asyncio.Task):
+        """Drop a finished timer flush and log its failure"""
+        self._flush_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error("Event batch flush failed", error=str(task.exception()), service=self.service_name)
+
+    async def _flush_batch(self, handler: Callable):
+        """Run a batch handler and ack/nack every buffered message"""
+        batch = self._batches.pop(handler, None)
+        if not batch:
+            return
+
+        try:
+            await handler([event for event, _ in batch])
+        except Exception as e:
+            if is_transient_error(e):
+                logger.error("Error processing event batch, requeued", error=str(e), size=len(batch))
+                await asyncio.sleep(self.retry_delay)
+                for _, message in batch:
+                    await message.nack(requeue=True)
+                return
+
+            logger.error("Error processing event batch", error=str(e), size=len(batch))
+            # One bad event must not hold back the others: retry them one at a time
+            for event, message in batch:
+                await self._handle_one(handler, event, message)
+            return
+
+        for event, message in batch:
+            self.processed_events.add(event.event_id)
+            await message.ack()
+
+    async def _handle_one(self, handler: Callable, event: EventEnvelope, message):
+        """Run a batch handler on a single event after its batch failed"""
+        try:
+            await handler([event])
+        except Exception as e:
+            requeue = is_transient_error(e)
+            logger.error(
+                "Error processing event, requeued" if requeue else "Invalid event, dropped",
+                error=str(e),
+                event_type=event.event_type,
+                event_id=event.event_id
+            )
+            await message.nack(requeue=requeue)
+            return
+
+        self.processed_events.add(event.event_id)
+        await message.ack()
+
+    async def _on_message(self, message):
+        """Process one incoming message"""
+        try:
+            event = EventEnvelope(**json.loads(message.body))
+
+            # Idempotency check
+            if event.event_id in self.processed_events:
+                logger.warning("Duplicate event ignored", event_id=event.event_id)
+                await message.ack()
+                return
+
+            if event.event_type in self.batch_handlers:
+                await self._enqueue(event, message)
+                return
+
+            # Find and execute handler
+            handler = self.handlers.get(event.event_type)
+            if handler:
+                logger.info("Processing event", event_type=event.event_type, event_id=event.event_id)
+                await handler(event)
+                self.processed_events.add(event.event_id)
+                await message.ack()
+            else:
+                logger.warning("No handler for event type", event_type=event.event_type)
+                await message.nack(requeue=False)
+
+        except Exception as e:
+            logger.error("Error processing event", error=str(e))
+            await message.nack(requeue=True)
+
+    async def consume(self):
+        """Bind registered event types and consume until cancelled"""
+        if not self.channel:
+            await self.connect()
+
+        # Prefetch must cover a full batch or batches only ever flush on timeout
+        batch_sizes = [batch_size for _, batch_size, _ in self.batch_handlers.values()]
+        await self.channel.set_qos(prefetch_count=max([10] + batch_sizes))
+
+        for event_type in {**self.handlers, **self.batch_handlers}:
+            await self.queue.bind(self.exchange, routing_key=event_type)
+
+        logger.info("Started consuming events", service=self.service_name)
+        async with self.queue.iterator() as messages:
+            async for message in messages:
+                await self._on_message(message)
+
+    async def close(self):
+        """Close RabbitMQ connection"""
+        await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        if self.connection and not self.connection.is_closed:
+            await self.connection.close()
+            logger.info("Event consumer connection closed", service=self.service_name)
@@ -3,16 +3,20 @@ Shared authentication and authorization utilities
 JWT token management and RBAC
 """
 from datetime import datetime, timedelta
-from typing import Optional, List
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import cached_property
+from typing import Optional, List, Dict, FrozenSet, Tuple
+from jose import JWTError, jwk, jwt
 from pydantic import BaseModel
 from fastapi import HTTPException, status, Depends, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import bcrypt
+import hashlib
 import os
+import time
+import uuid
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (bcrypt cost factor; CI can lower it to 4)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
 # JWT Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-super-secret-jwt-key-change-in-production")
@@ -20,16 +24,34 @@ ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 
+# Key object built once; passing the raw secret makes jose re-parse it on every call
+_JWT_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
+
+# Verified token cache (skips signature verification for recently seen tokens)
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("JWT_CACHE_TTL_SECONDS", "60"))
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("JWT_CACHE_MAX_SIZE", "10000"))
+
 security = HTTPBearer()
 
 
 class TokenData(BaseModel):
     """Token payload data"""
     user_id: str
+    user_uuid: uuid.UUID  # parsed once per token, reused by every write path
     username: str
     roles: List[str]
     scopes: List[str] = []
 
+    @cached_property
+    def role_set(self) -> FrozenSet[str]:
+        """Roles as a set, built once per cached token"""
+        return frozenset(self.roles)
+
+    @cached_property
+    def scope_set(self) -> FrozenSet[str]:
+        """Scopes as a set, built once per cached token"""
+        return frozenset(self.scopes)
+
 
 class TokenPair(BaseModel):
     """Access and refresh token pair"""
@@ -38,14 +60,19 @@ class TokenPair(BaseModel):
     token_type: str = "bearer"
 
 
+def _password_bytes(password: str) -> bytes:
+    """bcrypt only uses the first 72 bytes; truncate explicitly like passlib did"""
+    return password.encode("utf-8")[:72]
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode("utf-8"))
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(_password_bytes(password), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -57,7 +84,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -65,8 +92,9 @@ def create_refresh_token(data: dict) -> str:
     """Create a JWT refresh token"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # jti keeps tokens unique when issued twice within the same second
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -88,8 +116,35 @@ def create_token_pair(user_id: str, username: str, roles: List[str], scopes: Lis
     )
 
 
+# blake2b(token) -> (token_data, monotonic deadline), least recently used first
+_token_cache: Dict[bytes, Tuple[TokenData, float]] = {}
+
+
+def _token_key(token: str) -> bytes:
+    """Fixed-size cache key so raw bearer tokens are not kept in memory"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _cache_token(key: bytes, token_data: TokenData, exp: Optional[float]):
+    """Remember a verified token until the cache TTL or its own expiry, whichever is first"""
+    ttl = TOKEN_CACHE_TTL_SECONDS
+    if exp is not None:
+        ttl = min(ttl, float(exp) - time.time())
+
+    if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+        # Evict the least recently used entry (dicts keep insertion order)
+        _token_cache.pop(next(iter(_token_cache)), None)
+    _token_cache[key] = (token_data, time.monotonic() + ttl)
+
+
 def decode_token(token: str) -> TokenData:
     """Decode and validate a JWT token"""
+    key = _token_key(token)
+    cached = _token_cache.pop(key, None)
+    if cached and cached[1] > time.monotonic():
+        _token_cache[key] = cached
+        return cached[0]
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -97,7 +152,7 @@ def decode_token(token: str) -> TokenData:
     )
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, _JWT_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         username: str = payload.get("username")
         roles: List[str] = payload.get("roles", [])
@@ -106,12 +161,20 @@ def decode_token(token: str) -> TokenData:
         if user_id is None or username is None:
             raise credentials_exception
 
-        return TokenData(
+        try:
+            user_uuid = uuid.UUID(user_id)
+        except ValueError:
+            raise credentials_exception
+
+        token_data = TokenData(
             user_id=user_id,
+            user_uuid=user_uuid,
             username=username,
             roles=roles,
             scopes=scopes
         )
+        _cache_token(key, token_data, payload.get("exp"))
+        return token_data
     except JWTError:
         raise credentials_exception
 
@@ -124,8 +187,10 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(
 
 def require_roles(required_roles: List[str]):
     """Decorator to require specific roles"""
+    required = frozenset(required_roles)
+
     async def role_checker(current_user: TokenData = Depends(get_current_user)) -> TokenData:
-        if not any(role in current_user.roles for role in required_roles):
+        if required.isdisjoint(current_user.role_set):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions"
@@ -136,8 +201,10 @@ def require_roles(required_roles: List[str]):
 
 def require_scopes(required_scopes: List[str]):
     """Decorator to require specific scopes"""
+    required = frozenset(required_scopes)
+
     async def scope_checker(current_user: TokenData = Depends(get_current_user)) -> TokenData:
-        if not all(scope in current_user.scopes for scope in required_scopes):
+        if not required.issubset(current_user.scope_set):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient scopes"
@@ -5,7 +5,8 @@ from sqlalchemy import create_engine, Column, DateTime, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, declared_attr
 from sqlalchemy.pool import QueuePool
-from contextlib import contextmanager
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from contextlib import contextmanager, asynccontextmanager
 import os
 
 Base = declarative_base()
@@ -40,6 +41,23 @@ def get_database_url(default_db: str = "agricole_db") -> str:
     return f"postgresql://{user}:{password}@{host}:{port}/{default_db}"
 
 
+def get_pool_options() -> dict:
+    """Connection pool settings shared by sync and async engines.
+
+    Each uvicorn worker owns its own pool, so a service can open up to
+    (DB_POOL_SIZE + DB_MAX_OVERFLOW) x workers connections; keep that
+    total below PostgreSQL's max_connections.
+    """
+    return dict(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "30")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),  # Fail fast when exhausted
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),  # Drop connections idle-killed upstream
+        # Verify connections before using; costs a round trip per checkout
+        pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+    )
+
+
 def create_db_engine(database_url: str = None):
     """Create SQLAlchemy engine with proper configuration"""
     if database_url is None:
@@ -48,9 +66,28 @@ def create_db_engine(database_url: str = None):
     return create_engine(
         database_url,
         poolclass=QueuePool,
-        pool_size=10,
-        max_overflow=20,
-        pool_pre_ping=True,  # Verify connections before using
+        **get_pool_options(),
+        echo=os.getenv("DEBUG", "false").lower() == "true"
+    )
+
+
+def get_async_database_url(database_url: str = None) -> str:
+    """Get database URL using the asyncpg driver"""
+    if database_url is None:
+        database_url = get_database_url()
+
+    if database_url.startswith("postgresql://"):
+        return database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return database_url
+
+
+def create_async_db_engine(database_url: str = None):
+    """Create async SQLAlchemy engine (asyncpg) with proper configuration"""
+    return create_async_engine(
+        get_async_database_url(database_url),
+        **get_pool_options(),
+        # Per-connection LRU of prepared statements; set 0 behind a transaction-mode pgbouncer
+        connect_args={"prepared_statement_cache_size": int(os.getenv("DB_STATEMENT_CACHE_SIZE", "512"))},
         echo=os.getenv("DEBUG", "false").lower() == "true"
     )
 
@@ -60,6 +97,11 @@ def get_session_factory(engine):
     return sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def get_async_session_factory(engine):
+    """Create async session factory"""
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
 @contextmanager
 def get_db_session(session_factory):
     """Context manager for database sessions"""
@@ -72,3 +114,15 @@ def get_db_session(session_factory):
         raise
     finally:
         session.close()
+
+
+@asynccontextmanager
+async def get_async_db_session(session_factory):
+    """Async context manager for database sessions"""
+    async with session_factory() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
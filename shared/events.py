@@ -2,12 +2,14 @@
 Event-driven architecture utilities for RabbitMQ
 Implements Outbox pattern for reliable event publishing
 """
+import asyncio
 import json
 import os
+import threading
 import time
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, List, Tuple
 import pika
 import structlog
 from pydantic import BaseModel
@@ -34,6 +36,8 @@ class EventPublisher:
         self.service_name = service_name
         self.connection = None
         self.channel = None
+        # pika connections are not thread-safe; publishes may come from worker threads
+        self._lock = threading.Lock()
 
     def connect(self):
         """Establish connection to RabbitMQ"""
@@ -76,9 +80,6 @@ class EventPublisher:
         idempotency_key: Optional[str] = None
     ):
         """Publish an event to RabbitMQ"""
-        if not self.channel or self.channel.is_closed:
-            self.connect()
-
         event = EventEnvelope(
             event_id=str(uuid.uuid4()),
             event_type=event_type,
@@ -89,26 +90,39 @@ class EventPublisher:
             payload=payload
         )
 
-        try:
-            self.channel.basic_publish(
-                exchange='domain_events',
-                routing_key=event_type,
-                body=json.dumps(event.model_dump()),
-                properties=pika.BasicProperties(
-                    delivery_mode=2,  # Persistent message
-                    content_type='application/json',
+        with self._lock:
+            if not self.channel or self.channel.is_closed:
+                self.connect()
+
+            try:
+                self.channel.basic_publish(
+                    exchange='domain_events',
+                    routing_key=event_type,
+                    body=json.dumps(event.model_dump()),
+                    properties=pika.BasicProperties(
+                        delivery_mode=2,  # Persistent message
+                        content_type='application/json',
+                        correlation_id=event.correlation_id
+                    )
+                )
+                logger.info(
+                    "Event published",
+                    event_type=event_type,
+                    event_id=event.event_id,
                     correlation_id=event.correlation_id
                 )
-            )
-            logger.info(
-                "Event published",
-                event_type=event_type,
-                event_id=event.event_id,
-                correlation_id=event.correlation_id
-            )
-        except Exception as e:
-            logger.error("Failed to publish event", error=str(e), event_type=event_type)
-            raise
+            except Exception as e:
+                logger.error("Failed to publish event", error=str(e), event_type=event_type)
+                raise
+
+    def reconnect(self):
+        """Replace a connection that failed a publish (it may still report itself open)"""
+        with self._lock:
+            try:
+                self.close()
+            except Exception as e:
+                logger.warning("Failed to close broken RabbitMQ connection", error=str(e))
+            self.connect()
 
     def close(self):
         """Close RabbitMQ connection"""
@@ -117,6 +131,138 @@ class EventPublisher:
             logger.info("RabbitMQ connection closed", service=self.service_name)
 
 
+class QueuedEventPublisher:
+    """Buffers events on an asyncio queue and publishes them in batches off the event loop"""
+
+    def __init__(
+        self,
+        publisher: EventPublisher,
+        batch_size: int = 64,
+        max_wait_ms: int = 10,
+        max_queue_size: int = 10000
+    ):
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        # A failing event is retried on a fresh connection before it is dropped; the flusher
+        # then pauses once before sending the rest of its batch
+        self.publish_retries = int(os.getenv("RABBITMQ_PUBLISH_RETRIES", "2"))
+        self.failure_backoff = float(os.getenv("RABBITMQ_CONNECT_DELAY_SECONDS", "2"))
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self):
+        """Connect the underlying publisher and start the background flusher"""
+        self._loop = asyncio.get_running_loop()
+        await asyncio.to_thread(self.publisher.connect)
+        self._task = asyncio.create_task(self._run())
+
+    def publish_event(
+        self,
+        event_type: str,
+        payload: Dict[str, Any],
+        correlation_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None
+    ):
+        """Queue an event without waiting for the broker (safe to call from consumer threads)"""
+        item = (event_type, payload, correlation_id, idempotency_key)
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if self._loop is None or running_loop is self._loop:
+            self._enqueue(item)
+        else:
+            self._loop.call_soon_threadsafe(self._enqueue, item)
+
+    def _enqueue(self, item: Tuple):
+        """Put an event on the queue, dropping it when the queue is full"""
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            logger.warning("Event queue full, event dropped", event_type=item[0])
+
+    def _publish_batch(self, batch: List[Tuple]) -> List[Tuple]:
+        """Publish queued events in order; returns the unattempted rest if one had to be dropped"""
+        for index, item in enumerate(batch):
+            if not self._publish_with_retry(item):
+                return batch[index + 1:]
+        return []
+
+    def _publish_with_retry(self, item: Tuple) -> bool:
+        """Publish one event, reconnecting between attempts; False once it has been dropped"""
+        event_type, payload, correlation_id, idempotency_key = item
+        for attempt in range(self.publish_retries + 1):
+            try:
+                if attempt:
+                    self.publisher.reconnect()
+                self.publisher.publish_event(event_type, payload, correlation_id, idempotency_key)
+                return True
+            except Exception as e:
+                error = e
+
+        logger.error(
+            "Event publish failed, event dropped",
+            error=str(error),
+            event_type=event_type,
+            attempts=self.publish_retries + 1
+        )
+        return False
+
+    async def _collect(self, batch: List[Tuple]) -> bool:
+        """Fill batch up to batch_size (or with whatever arrives within max_wait); True on shutdown"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        if not batch:
+            item = await self.queue.get()
+            if item is None:
+                return True
+            batch.append(item)
+
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                item = self.queue.get_nowait()
+            else:
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    return False
+            if item is None:
+                return True
+            batch.append(item)
+        return False
+
+    async def _run(self):
+        """Publish batches per thread hop; the rest of a batch cut short by a dropped event goes first next time"""
+        unsent: List[Tuple] = []
+        stopping = False
+        while not stopping:
+            batch, unsent = unsent, []
+            stopping = await self._collect(batch)
+            if not batch:
+                continue
+
+            unsent = await asyncio.to_thread(self._publish_batch, batch)
+            if unsent and stopping:
+                logger.error(
+                    "Event publisher stopped, events dropped",
+                    dropped=len(unsent),
+                    event_types=[item[0] for item in unsent]
+                )
+            elif unsent:
+                await asyncio.sleep(self.failure_backoff)
+
+    async def close(self):
+        """Flush queued events, stop the flusher and close the connection"""
+        if self._task:
+            await self.queue.put(None)
+            await self._task
+            self._task = None
+        self.publisher.close()
+
+
 class EventConsumer:
     """RabbitMQ event consumer with handler registration"""
 